@@ -4,9 +4,26 @@ import csv
 import datetime
 import os
 import json
+import queue
+import socket
 from PIL import Image, ImageTk, ImageOps
 import sys
 
+from kiosk_sync import SyncClient
+from canvas_grid import CanvasGrid
+from badge_scanner import BadgeScanner
+from toast import Toast
+
+# Storage code shared with the web server lives in ../Shared (bundled via --paths for the .exe)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Shared"))
+import meetings
+import roster_import
+import seasons
+from attendance_log import records_between
+from bitmaps import AttendanceBitmaps
+from file_lock import FileLock
+from journal import Journal
+
 # ---------------- Config ----------------
 DATA_FOLDER = "data"
 ASSETS_FOLDER = "assets"
@@ -14,11 +31,22 @@ FILENAME = os.path.join(DATA_FOLDER, "attendance.csv")  # Move attendance.csv to
 STUDENTS_FILE = os.path.join(DATA_FOLDER, "students.json")  # Move students.json to the data folder
 LOGO_FILE = os.path.join(ASSETS_FOLDER, "logo.png")  # Move logo.png to the assets folder
 GEAR_FILE = os.path.join(ASSETS_FOLDER, "gear.png")  # Move gear.png to the assets folder
+CONFIG_FILE = os.path.join(DATA_FOLDER, "config.json")  # Optional settings, e.g. {"sync_url": "http://mentor-pc:5000"}
+SYNC_OUTBOX_FILE = os.path.join(DATA_FOLDER, "sync_outbox.jsonl")  # Check-ins waiting to reach the server
+LOCK_FILE = os.path.join(DATA_FOLDER, "attendance.lock")  # Shared with command-line tools such as Shared/seasons.py
+MEETINGS_FILE = os.path.join(DATA_FOLDER, meetings.MEETINGS_FILE)  # Meeting days; missing students on them count as Absent
+BADGES_FILE = os.path.join(DATA_FOLDER, "badges.json")  # Optional {"badge code": "Student Name"} for RFID tags
+SYNC_POLL_MS = 500  # How often the GUI picks up roster/presence changes from the sync thread
 ADMIN_PIN = "1164"
 HEADER_HEIGHT = 150  # Increased header height
 HEADER_COLOR = "#5D3FD3"  # Updated header color
 
 # ---------------- Storage Helpers ----------------
+# Every attendance and roster change goes through the write-ahead journal (see Shared/journal.py)
+data_lock = FileLock(LOCK_FILE)
+journal = Journal(FILENAME, STUDENTS_FILE, lock=lambda: data_lock, key=lambda rec: rec.name)  # the kiosk knows students by name
+bitmaps = AttendanceBitmaps(FILENAME, key=lambda rec: rec.name)  # who was Present on which meeting day; built on first use
+
 def init_files():
     # Ensure the data folder exists
     os.makedirs(DATA_FOLDER, exist_ok=True)
@@ -30,6 +58,13 @@ def init_files():
         with open(STUDENTS_FILE, "w", encoding="utf-8") as f:
             json.dump(["placeholder1", "placeholder2", "placeholder3", "placeholder4"], f, indent=2)
 
+def load_config():
+    try:
+        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller .exe"""
     if hasattr(sys, "_MEIPASS"):
@@ -41,27 +76,30 @@ def load_students():
         return json.load(f)
 
 def save_students(students):
-    with open(STUDENTS_FILE, "w", encoding="utf-8") as f:
-        json.dump(students, f, indent=2, ensure_ascii=False)
+    journal.save_roster(students)
 
-def already_checked_in(name, date_iso):
+def load_badges():
     try:
-        with open(FILENAME, "r", encoding="utf-8") as f:
-            r = csv.DictReader(f)
-            for row in r:
-                if row["Date"] == date_iso and row["Name"] == name and row["Status"] == "Present":
-                    return True
-    except FileNotFoundError:
-        return False
-    return False
+        with open(BADGES_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def checked_in_names(date_iso):
+    # Today's check-ins are kept in memory by the journal; older dates seek through the .idx sidecar
+    present = journal.present_on(date_iso)
+    if present is not None:
+        return present
+    return {rec.name for rec in records_between(FILENAME, date_iso, date_iso) if rec.status == "Present"}
+
+def already_checked_in(name, date_iso):
+    return name in checked_in_names(date_iso)
 
 def mark_attendance(name, status="Present"):
     today = datetime.date.today().isoformat()
     if status == "Present" and already_checked_in(name, today):
         return False, f"{name} is already marked Present today."
-    with open(FILENAME, "a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow([today, name, status])
+    journal.append([[today, name, status]])
     return True, f"Welcome, {name}! You're marked {status}."
 
 # ---------------- GUI App ----------------
@@ -169,19 +207,133 @@ class AttendanceApp:
         self.container = tk.Frame(root, bg="black")
         self.container.pack(fill="both", expand=True)
 
+        # Optional single-canvas grid: scrolls, and stays fast with hundreds of students
+        config = load_config()
+        self.season_start = config.get("season_start", seasons.DEFAULT_START)  # e.g. "09-01" for school-year seasons
+        self.canvas_grid = None
+        if config.get("grid_renderer") == "canvas":
+            self.canvas_grid = CanvasGrid(self.container, command=self.checkin)
+            self.canvas_grid.pack(fill="both", expand=True)
+
         self.students = load_students()
+
+        # Optional sync with the Flask server: check-ins are journaled locally and pushed in the background
+        self.sync = None
+        self.student_ids = {}       # name -> server student ID, from the synced roster
+        self.remote_present = set()  # names marked Present on remote_present_date on any kiosk
+        self.remote_present_date = datetime.date.today().isoformat()
+        if config.get("sync_url"):
+            self.sync = SyncClient(config["sync_url"], config.get("sync_pin", ""),
+                                   config.get("kiosk_id") or socket.gethostname(), SYNC_OUTBOX_FILE)
+            self.sync.start()
+            self.root.after(SYNC_POLL_MS, self._apply_sync_updates)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Optional badge scanner mode: scans check in directly and feedback is a fading toast, not a dialog
+        self.toast = None
+        self.badges = {}  # normalized badge code -> student name
+        if config.get("scanner"):
+            self.toast = Toast(self.root)
+            BadgeScanner(self.root, self.scan_checkin)
+            self.title_label.configure(text="📌 Scan Your Badge or Tap Your Name")
+            self.root.focus_force()
+
+        self.index_badges()
         self.build_student_buttons()
 
+    def on_close(self):
+        if self.sync:
+            self.sync.stop()
+        journal.close()  # Snapshot now so the next start reads nothing but the snapshot
+        self.root.destroy()
+
+    def _apply_sync_updates(self):
+        changed = False
+        while True:
+            try:
+                kind, data = self.sync.updates.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "roster":
+                self.student_ids = {name: sid for sid, name in data.items()}
+                names = list(data.values())
+                if names != self.students:
+                    self.students = names
+                    save_students(self.students)  # Local copy keeps the kiosk usable offline
+                    changed = True
+                self.index_badges()
+            elif kind == "present" and data.get("date") == datetime.date.today().isoformat():
+                present = set(data.get("present", []))
+                remote = self.present_today()
+                if not present <= remote:
+                    changed = True
+                remote |= present
+        if self.remote_present_date != datetime.date.today().isoformat():
+            changed = True  # past midnight: yesterday's check marks come off
+        if changed:
+            self.build_student_buttons()
+        self.root.after(SYNC_POLL_MS, self._apply_sync_updates)
+
+    def present_today(self):
+        # Names other kiosks marked Present, cleared when the date changes
+        today = datetime.date.today().isoformat()
+        if self.remote_present_date != today:
+            self.remote_present, self.remote_present_date = set(), today
+        return self.remote_present
+
+    def record_checkin(self, name):
+        # Written locally first so the kiosk answers instantly; the sync thread delivers it later
+        today = datetime.date.today().isoformat()
+        if name in self.present_today():
+            return False, f"{name} is already marked Present today."
+        ok, msg = mark_attendance(name)
+        if ok and self.sync:
+            self.present_today().add(name)
+            self.sync.record("checkin", date=today, name=name, sid=self.student_ids.get(name), status="Present")
+        return ok, msg
+
     def toggle_fullscreen(self, event=None):
         self.fullscreen = not self.fullscreen
         self.root.attributes("-fullscreen", self.fullscreen)
 
+    def index_badges(self):
+        # Rebuilt on every roster change so a scan is one dict lookup.
+        # Badges may carry the server student ID, the name, or an RFID code listed in badges.json
+        badges = {name.casefold(): name for name in self.students}
+        badges.update((str(sid).casefold(), name) for name, sid in self.student_ids.items() if sid)
+        badges.update((str(code).strip().casefold(), name) for code, name in load_badges().items())
+        self.badges = badges
+
+    def scan_checkin(self, code):
+        name = self.badges.get(code.casefold())
+        if name is None:
+            self.notify(False, f"Badge {code} not recognized. Tap your name or ask a mentor.", "error")
+            return
+        self.checkin(name)
+
+    def notify(self, ok, msg, kind=None):
+        if self.toast:
+            self.toast.show(msg, kind or ("ok" if ok else "warning"))
+        elif ok:
+            messagebox.showinfo("Success", msg)
+        else:
+            messagebox.showwarning("Already Checked In", msg)
+
     def build_student_buttons(self):
+        today = datetime.date.today().isoformat()
+        present = checked_in_names(today) | self.present_today()  # One lookup for the whole grid
+
+        if self.canvas_grid:
+            # Only tiles whose label changed get redrawn
+            self.canvas_grid.set_items([
+                (name, f"🙋 {name}" + (" ✅" if name in present else ""))
+                for name in self.students
+            ])
+            return
+
         for widget in self.container.winfo_children():
             widget.destroy()
 
-        today = datetime.date.today().isoformat()
-
         COLS = 4  # Number of buttons per row
         for c in range(COLS):
             self.container.grid_columnconfigure(c, weight=1)  # Ensure columns expand evenly
@@ -189,7 +341,7 @@ class AttendanceApp:
         # Arrange buttons in a grid
         row, col = 0, 0
         for name in self.students:
-            checked = already_checked_in(name, today)
+            checked = name in present
             text = f"🙋 {name}" + (" ✅" if checked else "")
             btn = tk.Button(
                 self.container,
@@ -214,11 +366,8 @@ class AttendanceApp:
             self.container.grid_columnconfigure(c, weight=1)
 
     def checkin(self, name):
-        ok, msg = mark_attendance(name)
-        if ok:
-            messagebox.showinfo("Success", msg)
-        else:
-            messagebox.showwarning("Already Checked In", msg)
+        ok, msg = self.record_checkin(name)
+        self.notify(ok, msg)
         self.build_student_buttons()
 
     def admin_panel(self):
@@ -255,12 +404,27 @@ class AttendanceApp:
         tk.Button(btn_frame, text="Add Student", command=lambda: self._add_student_and_refresh(admin_win),
                   bg="purple", fg="white", font=("Arial", 12, "bold")).pack(side="left", padx=5)
 
+        tk.Button(btn_frame, text="Import Students", command=lambda: self._import_students_and_refresh(admin_win),
+                  bg="purple", fg="white", font=("Arial", 12, "bold")).pack(side="left", padx=5)
+
         tk.Button(btn_frame, text="Delete Student", command=lambda: self._delete_student_and_refresh(admin_win),
                   bg="red", fg="white", font=("Arial", 12, "bold")).pack(side="left", padx=5)
 
         tk.Button(btn_frame, text="Download CSV", command=self.download_csv,
                   bg="green", fg="white", font=("Arial", 12, "bold")).pack(side="left", padx=5)
 
+        tk.Button(btn_frame, text="Who Was There?", command=self.attendance_sets,
+                  bg="green", fg="white", font=("Arial", 12, "bold")).pack(side="left", padx=5)
+
+        tk.Button(btn_frame, text="Meeting Calendar", command=self.meeting_calendar,
+                  bg="green", fg="white", font=("Arial", 12, "bold")).pack(side="left", padx=5)
+
+        tk.Button(btn_frame, text="Past Seasons", command=self.past_seasons,
+                  bg="green", fg="white", font=("Arial", 12, "bold")).pack(side="left", padx=5)
+
+        tk.Button(btn_frame, text="Roll Over Season", command=lambda: self._rollover_and_refresh(admin_win),
+                  bg="red", fg="white", font=("Arial", 12, "bold")).pack(side="left", padx=5)
+
         tk.Button(btn_frame, text="Close", command=admin_win.destroy,
                   bg="gray", fg="white", font=("Arial", 12, "bold")).pack(side="left", padx=5)
 
@@ -270,16 +434,57 @@ class AttendanceApp:
         if name:
             self.students.append(name)
             save_students(self.students)
+            if self.sync:
+                self.sync.record("student_add", name=name)
+            self.index_badges()
             self.build_student_buttons()
             messagebox.showinfo("Added", f"Student {name} added.")
             tree = admin_win.winfo_children()[0].winfo_children()[0]  # Get the tree view
             self.refresh_admin_panel(tree)
 
+    def _import_students_and_refresh(self, admin_win):
+        path = filedialog.askopenfilename(title="Import Students",
+                                          filetypes=[("Roster files", "*.csv *.json *.jsonl *.txt"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            with open(path, "r", encoding="utf-8-sig", newline="") as f:
+                report = roster_import.plan_import(roster_import.read_rows(f), self.students)
+        except (OSError, ValueError, UnicodeDecodeError, csv.Error) as e:
+            messagebox.showerror("Error", f"Could not read {os.path.basename(path)}: {e}")
+            return
+
+        # One roster write and one redraw for the whole file
+        names = [name for _, name in report.added]
+        if names:
+            self.students.extend(names)
+            save_students(self.students)
+            if self.sync:
+                for name in names:
+                    self.sync.record("student_add", name=name)
+            self.index_badges()
+            self.build_student_buttons()
+            tree = admin_win.winfo_children()[0].winfo_children()[0]  # Get the tree view
+            self.refresh_admin_panel(tree)
+
+        problems = [f"Line {line}: {msg}" for line, msg in report.conflicts + report.errors]
+        text = f"Added {len(names)} students.\n{report.summary()}"
+        if problems:
+            text += "\n\n" + "\n".join(problems[:15])
+            if len(problems) > 15:
+                text += f"\n…and {len(problems) - 15} more"
+            messagebox.showwarning("Import Students", text)
+        else:
+            messagebox.showinfo("Import Students", text)
+
     def _delete_student_and_refresh(self, admin_win):
         name = simpledialog.askstring("Delete Student", "Enter Student Name to delete:")
         if name in self.students:
             self.students.remove(name)
             save_students(self.students)
+            if self.sync:
+                self.sync.record("student_delete", name=name, sid=self.student_ids.get(name))
+            self.index_badges()
             self.build_student_buttons()
             messagebox.showinfo("Deleted", f"Student {name} removed.")
             tree = admin_win.winfo_children()[0].winfo_children()[0]  # Get the tree view
@@ -294,14 +499,162 @@ class AttendanceApp:
                 f_out.write(f_in.read())
             messagebox.showinfo("Success", f"CSV saved to {save_path}")
 
+    def _rollover_and_refresh(self, admin_win):
+        if not messagebox.askyesno("Roll Over Season",
+                                   "Move all past seasons out of attendance.csv into compressed archives?\n"
+                                   "They stay available under Past Seasons."):
+            return
+        try:
+            counts = seasons.rollover(journal, self.season_start)
+        except (OSError, RuntimeError) as e:
+            messagebox.showerror("Error", f"Rollover failed: {e}")
+            return
+        if not counts:
+            messagebox.showinfo("Roll Over Season", "Nothing to archive: the log only holds the current season.")
+            return
+        self.build_student_buttons()
+        tree = admin_win.winfo_children()[0].winfo_children()[0]  # Get the tree view
+        self.refresh_admin_panel(tree)
+        lines = [f"{label}: {n} rows" for label, n in sorted(counts.items())]
+        messagebox.showinfo("Roll Over Season", "Archived:\n" + "\n".join(lines))
+
+    def past_seasons(self):
+        labels = seasons.list_seasons(FILENAME)
+        if not labels:
+            messagebox.showinfo("Past Seasons", "No seasons have been archived yet.")
+            return
+
+        win = tk.Toplevel(self.root)
+        win.title("Past Seasons")
+        win.geometry("600x500")
+        top = tk.Frame(win)
+        top.pack(fill="x", padx=10, pady=10)
+        choice = tk.StringVar(value=labels[-1])
+        picker = ttk.Combobox(top, textvariable=choice, values=labels, state="readonly", width=12)
+        picker.pack(side="left")
+        info = tk.Label(top, font=("Arial", 12))
+        info.pack(side="left", padx=10)
+
+        cols = ("Name", "Present", "Absent")
+        tree = ttk.Treeview(win, columns=cols, show="headings")
+        for col in cols:
+            tree.heading(col, text=col)
+            tree.column(col, width=150 if col != "Name" else 250)
+        tree.pack(fill="both", expand=True)
+
+        def show(event=None):
+            # Summaries are cached next to the archive, so this doesn't decompress anything
+            summary = seasons.season_summary(FILENAME, choice.get())
+            info.configure(text=f"{summary['first']} to {summary['last']}, {summary['meeting_days']} meeting days")
+            tree.delete(*tree.get_children())
+            for entry in sorted(summary["students"].values(), key=lambda e: (-e["present"], e["name"].lower())):
+                tree.insert("", "end", values=(entry["name"], entry["present"], entry["absent"]))
+
+        def export():
+            save_path = filedialog.asksaveasfilename(defaultextension=".csv", initialfile=f"attendance-{choice.get()}.csv",
+                                                     filetypes=[("CSV files", "*.csv")])
+            if save_path:
+                with open(save_path, "w", newline="", encoding="utf-8") as f:
+                    seasons.export_season(FILENAME, choice.get(), f)
+                messagebox.showinfo("Success", f"CSV saved to {save_path}")
+
+        tk.Button(top, text="Export CSV", command=export, bg="green", fg="white",
+                  font=("Arial", 12, "bold")).pack(side="right")
+        picker.bind("<<ComboboxSelected>>", show)
+        show()
+
+    def meeting_calendar(self):
+        # Absences are never written: on these days, students who didn't check in are Absent
+        calendar = meetings.load_calendar(MEETINGS_FILE)
+        win = tk.Toplevel(self.root)
+        win.title("Meeting Calendar")
+        win.geometry("600x400")
+        tk.Label(win, text="Weekly schedules, one per line (e.g. Tue,Thu 2025-09-02..2026-06-15):",
+                 font=("Arial", 12)).pack(anchor="w", padx=10, pady=(10, 0))
+        weekly = tk.Text(win, font=("Arial", 12), height=5)
+        weekly.pack(fill="x", padx=10)
+        weekly.insert("1.0", "\n".join(meetings.format_weekly(e) for e in calendar["weekly"]))
+        fields = {}
+        for key, label in (("dates", "One-off meetings (e.g. 2025-10-04, 2025-10-11):"),
+                           ("cancelled", "Cancelled meetings:")):
+            tk.Label(win, text=label, font=("Arial", 12)).pack(anchor="w", padx=10, pady=(10, 0))
+            fields[key] = tk.Entry(win, font=("Arial", 12))
+            fields[key].pack(fill="x", padx=10)
+            fields[key].insert(0, ", ".join(calendar[key]))
+
+        def save():
+            try:
+                meetings.save_calendar(MEETINGS_FILE, {
+                    "weekly": [meetings.parse_weekly(line) for line in weekly.get("1.0", "end").splitlines() if line.strip()],
+                    "dates": meetings.parse_dates(fields["dates"].get()),
+                    "cancelled": meetings.parse_dates(fields["cancelled"].get()),
+                })
+            except ValueError as e:
+                messagebox.showerror("Error", f"Calendar not saved: {e}", parent=win)
+                return
+            win.destroy()
+
+        tk.Button(win, text="Save", command=save, bg="green", fg="white",
+                  font=("Arial", 12, "bold")).pack(pady=10)
+
+    def attendance_sets(self):
+        win = tk.Toplevel(self.root)
+        win.title("Who Was There?")
+        win.geometry("600x550")
+        form = tk.Frame(win)
+        form.pack(fill="x", padx=10, pady=10)
+        fields = {}
+        for row, (which, label) in enumerate((("all", "Present on all of"), ("any", "Present on any of"),
+                                              ("none", "Absent from all of"))):
+            tk.Label(form, text=label, font=("Arial", 12)).grid(row=row, column=0, sticky="w")
+            fields[which] = tk.Entry(form, font=("Arial", 12), width=40)
+            fields[which].grid(row=row, column=1, padx=5, pady=2)
+        tk.Label(form, text="Dates like 2025-10-04,2025-10-11 or ranges like 2025-10-06..2025-10-12",
+                 font=("Arial", 10)).grid(row=3, column=0, columnspan=2, sticky="w")
+        info = tk.Label(win, font=("Arial", 12))
+        info.pack(fill="x", padx=10)
+
+        cols = ("Name", "Attended")
+        tree = ttk.Treeview(win, columns=cols, show="headings")
+        for col in cols:
+            tree.heading(col, text=col)
+            tree.column(col, width=250 if col == "Name" else 150)
+        tree.pack(fill="both", expand=True)
+
+        def find(event=None):
+            # Bitwise AND/OR over per-day bitsets; only rows logged since the last question are read
+            bitmaps.refresh()
+            days = {}
+            for which, entry in fields.items():
+                spec = entry.get().strip()
+                try:
+                    days[which] = bitmaps.days_in(spec) if spec else []
+                except ValueError as e:
+                    info.configure(text=f"{which.title()}: {e}.")
+                    return
+            if not any(days.values()):
+                info.configure(text="Fill in at least one box.")
+                return
+            bits = bitmaps.select(days["all"], days["any"], days["none"], among=bitmaps.mask(self.students))
+            named = days["all"] + days["any"] + days["none"]
+            start, end = min(named), max(named)
+            tree.delete(*tree.get_children())
+            names = sorted(bitmaps.keys(bits), key=str.lower)
+            for name in names:
+                attended, meetings = bitmaps.attended(name, start, end)
+                tree.insert("", "end", values=(name, f"{attended} of {meetings}"))
+            info.configure(text=f"{len(names)} students (attendance counted {start} to {end})")
+
+        tk.Button(form, text="Find", command=find, bg="green", fg="white",
+                  font=("Arial", 12, "bold")).grid(row=0, column=2, rowspan=3, padx=5)
+        for entry in fields.values():
+            entry.bind("<Return>", find)
+
     def guest_sign_in(self):
         name = simpledialog.askstring("Guest Sign In", "Enter your name:")
         if name:
-            ok, msg = mark_attendance(name)
-            if ok:
-                messagebox.showinfo("Success", msg)
-            else:
-                messagebox.showwarning("Already Checked In", msg)
+            ok, msg = self.record_checkin(name)
+            self.notify(ok, msg)
             self.build_student_buttons()
             # Refresh the admin panel if it's open
             for window in self.root.winfo_children():
@@ -330,25 +683,10 @@ class AttendanceApp:
             messagebox.showerror("Error", "You can only remove entries from today's attendance.")
             return
 
-        # Remove the entry from the CSV file
-        updated_rows = []
-        entry_removed = False
+        # Remove the first matching entry; the journal rewrites the CSV atomically so a crash can't truncate it
         try:
-            with open(FILENAME, "r", encoding="utf-8") as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if row == ["Date", "Name", "Status"]:  # Keep the header row
-                        updated_rows.append(row)
-                    elif row[0] == date and row[1] == name and row[2] == status and not entry_removed:
-                        # Skip the first matching entry (remove it)
-                        entry_removed = True
-                    else:
-                        updated_rows.append(row)
-
-            # Write the updated rows back to the CSV file
-            with open(FILENAME, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerows(updated_rows)
+            entry_removed = journal.remove(
+                lambda rec: (rec.date, rec.name, rec.status) == (date, str(name), status), limit=1)
 
             # Refresh the admin panel
             if entry_removed:
@@ -375,6 +713,8 @@ class AttendanceApp:
 # ---------------- Run App ----------------
 if __name__ == "__main__":
     init_files()
+    journal.recover()  # Finish any change cut off by a crash, then load the latest snapshot
+    seasons.finish_pending(FILENAME)  # ...including a season rollover
     root = tk.Tk()
 
     # Set window icon
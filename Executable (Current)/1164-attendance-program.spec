@@ -3,7 +3,7 @@
 
 a = Analysis(
     ['1164-attendance-program.py'],
-    pathex=[],
+    pathex=['..\\Shared'],
     binaries=[],
     datas=[],
     hiddenimports=[],
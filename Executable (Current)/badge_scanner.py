@@ -0,0 +1,50 @@
+"""Keyboard-wedge badge scanner input for the Tk kiosk.
+
+USB barcode and RFID readers act like a keyboard: they "type" the badge code
+and usually press Enter. BadgeScanner listens to key presses on the kiosk
+window and tells a scan apart from a person at the keyboard by speed: a
+scanner sends its characters a few milliseconds apart, so any gap longer than
+max_gap_ms starts over. Readers configured without an Enter suffix are handled
+by treating a pause after a fast burst as the end of the code.
+
+Enable it with {"scanner": true} in data/config.json.
+"""
+SCAN_END_KEYS = ("Return", "KP_Enter", "Tab")
+
+
+class BadgeScanner:
+    def __init__(self, root, on_scan, max_gap_ms=60, idle_ms=150, min_length=3):
+        self.root = root
+        self.on_scan = on_scan  # called with the scanned code (stripped, case kept)
+        self.max_gap_ms = max_gap_ms
+        self.idle_ms = idle_ms
+        self.min_length = min_length
+        self.buffer = []
+        self.last_time = None
+        self._idle_job = None
+        # The toplevel's binding applies to every widget in the kiosk window, whichever has focus
+        root.bind("<Key>", self._on_key, add="+")
+
+    def _on_key(self, event):
+        if self.last_time is not None and event.time - self.last_time > self.max_gap_ms:
+            self.buffer = []  # Too slow to be a scanner: start over
+        self.last_time = event.time
+
+        if event.keysym in SCAN_END_KEYS:
+            self._finish()
+            return "break" if event.keysym == "Tab" else None
+        if event.char and event.char.isprintable():
+            self.buffer.append(event.char)
+            if self._idle_job is not None:
+                self.root.after_cancel(self._idle_job)
+            self._idle_job = self.root.after(self.idle_ms, self._finish)
+
+    def _finish(self):
+        if self._idle_job is not None:
+            self.root.after_cancel(self._idle_job)
+            self._idle_job = None
+        code = "".join(self.buffer).strip()
+        self.buffer = []
+        self.last_time = None
+        if len(code) >= self.min_length:
+            self.on_scan(code)
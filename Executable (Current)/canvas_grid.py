@@ -0,0 +1,191 @@
+"""Single-canvas student grid for the Tk kiosk.
+
+Draws the student tiles on one tk.Canvas instead of creating a tk.Button per
+student. Only the rows in (or just outside) the visible area have canvas
+items; they are recycled as the grid scrolls. Taps are hit-tested from the
+pointer position, and set_items() only reconfigures tiles whose label
+changed. Work per frame depends on the window size, not on the roster size.
+
+Enable it with {"grid_renderer": "canvas"} in data/config.json.
+"""
+import tkinter as tk
+from tkinter import font as tkfont
+
+DRAG_THRESHOLD = 10  # pixels a touch has to move before it scrolls instead of tapping
+OVERSCAN_ROWS = 1    # rows kept drawn above and below the viewport
+
+
+class CanvasGrid(tk.Frame):
+    def __init__(self, master, command, cols=4, tile_height=64, gap=12, bg="black",
+                 tile_bg="#333", tile_active_bg="#555", fg="white", font=("Arial", 14, "bold")):
+        super().__init__(master, bg=bg)
+        self.command = command  # called with the key of the tapped tile
+        self.cols = cols
+        self.tile_h = tile_height
+        self.gap = gap
+        self.tile_bg = tile_bg
+        self.tile_active_bg = tile_active_bg
+        self.fg = fg
+        self.font = tkfont.Font(family=font[0], size=font[1], weight=font[2])
+
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0, bd=0, yscrollincrement=8)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_yscroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.items = []    # (key, label) per tile, in display order
+        self.drawn = {}    # tile index -> [rect id, text id, label shown]
+        self.spare = []    # recycled [rect id, text id] pairs
+        self.tile_w = 1
+        self._press = None  # (y, tile index or None, dragging)
+
+        self.canvas.bind("<Configure>", self._on_configure)
+        self.canvas.bind("<ButtonPress-1>", self._on_press)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<ButtonRelease-1>", self._on_release)
+        # Wheel events go to the focused widget, so grab them only while the pointer is over the grid
+        self.canvas.bind("<Enter>", self._bind_wheel)
+        self.canvas.bind("<Leave>", self._unbind_wheel)
+
+    # ---------- Data ----------
+    def set_items(self, items):
+        """Show [(key, label), ...]; only tiles whose label changed are redrawn."""
+        old = self.items
+        self.items = list(items)
+        if len(old) != len(self.items):
+            self._update_scrollregion()
+        for i, tile in list(self.drawn.items()):
+            if i >= len(self.items):
+                self._recycle(i)
+            elif tile[2] != self.items[i][1]:
+                tile[2] = self.items[i][1]
+                self.canvas.itemconfigure(tile[1], text=tile[2])
+        self._sync()
+
+    # ---------- Layout ----------
+    def _row_h(self):
+        return self.tile_h + self.gap
+
+    def _update_scrollregion(self):
+        rows = (len(self.items) + self.cols - 1) // self.cols
+        height = max(rows * self._row_h() + self.gap, self.canvas.winfo_height())
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), height))
+
+    def _on_configure(self, event):
+        tile_w = max(1, (event.width - self.gap * (self.cols + 1)) // self.cols)
+        if tile_w != self.tile_w:
+            self.tile_w = tile_w
+            for i, tile in self.drawn.items():
+                self._place(i, tile)
+        self._update_scrollregion()
+        self._sync()
+
+    def _place(self, i, tile):
+        row, col = divmod(i, self.cols)
+        x0 = self.gap + col * (self.tile_w + self.gap)
+        y0 = self.gap + row * self._row_h()
+        self.canvas.coords(tile[0], x0, y0, x0 + self.tile_w, y0 + self.tile_h)
+        self.canvas.coords(tile[1], x0 + self.tile_w / 2, y0 + self.tile_h / 2)
+        self.canvas.itemconfigure(tile[1], width=self.tile_w - 16)
+
+    def _visible_range(self):
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first_row = max(0, int(top // self._row_h()) - OVERSCAN_ROWS)
+        last_row = int(bottom // self._row_h()) + OVERSCAN_ROWS
+        return first_row * self.cols, min(len(self.items), (last_row + 1) * self.cols)
+
+    def _sync(self):
+        # Make canvas items exist for exactly the tiles near the viewport
+        lo, hi = self._visible_range()
+        for i in [i for i in self.drawn if i < lo or i >= hi]:
+            self._recycle(i)
+        for i in range(lo, hi):
+            if i not in self.drawn:
+                self._draw(i)
+
+    def _draw(self, i):
+        label = self.items[i][1]
+        if self.spare:
+            rect, text = self.spare.pop()
+            self.canvas.itemconfigure(rect, state="normal", fill=self.tile_bg)
+            self.canvas.itemconfigure(text, state="normal", text=label)
+        else:
+            rect = self.canvas.create_rectangle(0, 0, 0, 0, fill=self.tile_bg, outline="#666", width=2)
+            text = self.canvas.create_text(0, 0, text=label, fill=self.fg, font=self.font, justify="center")
+        tile = self.drawn[i] = [rect, text, label]
+        self._place(i, tile)
+
+    def _recycle(self, i):
+        rect, text, _ = self.drawn.pop(i)
+        self.canvas.itemconfigure(rect, state="hidden")
+        self.canvas.itemconfigure(text, state="hidden")
+        self.spare.append([rect, text])
+
+    # ---------- Input ----------
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._sync()
+
+    def _tile_at(self, x, y):
+        cx, cy = self.canvas.canvasx(x), self.canvas.canvasy(y)
+        col = int((cx - self.gap) // (self.tile_w + self.gap))
+        row = int((cy - self.gap) // self._row_h())
+        if not 0 <= col < self.cols or row < 0:
+            return None
+        # Taps in the gaps between tiles don't count
+        if cx - self.gap - col * (self.tile_w + self.gap) > self.tile_w or cy - self.gap - row * self._row_h() > self.tile_h:
+            return None
+        i = row * self.cols + col
+        return i if i < len(self.items) else None
+
+    def _set_active(self, i, active):
+        tile = self.drawn.get(i)
+        if tile:
+            self.canvas.itemconfigure(tile[0], fill=self.tile_active_bg if active else self.tile_bg)
+
+    def _on_press(self, event):
+        i = self._tile_at(event.x, event.y)
+        self._press = (event.y, i, False)
+        self.canvas.scan_mark(0, event.y)
+        self._set_active(i, True)
+
+    def _on_drag(self, event):
+        if self._press is None:
+            return
+        y, i, dragging = self._press
+        if not dragging and abs(event.y - y) > DRAG_THRESHOLD:
+            dragging = True
+            self._set_active(i, False)
+            self._press = (y, i, True)
+        if dragging:
+            self.canvas.scan_dragto(0, event.y, gain=1)
+
+    def _on_release(self, event):
+        if self._press is None:
+            return
+        _, i, dragging = self._press
+        self._press = None
+        self._set_active(i, False)
+        if not dragging and i is not None and i == self._tile_at(event.x, event.y):
+            self.command(self.items[i][0])
+
+    def _bind_wheel(self, event=None):
+        self.canvas.bind_all("<MouseWheel>", self._on_wheel)
+        self.canvas.bind_all("<Button-4>", self._on_wheel)
+        self.canvas.bind_all("<Button-5>", self._on_wheel)
+
+    def _unbind_wheel(self, event=None):
+        self.canvas.unbind_all("<MouseWheel>")
+        self.canvas.unbind_all("<Button-4>")
+        self.canvas.unbind_all("<Button-5>")
+
+    def _on_wheel(self, event):
+        if getattr(event, "num", None) == 4:
+            steps = -3
+        elif getattr(event, "num", None) == 5:
+            steps = 3
+        else:
+            steps = -3 if event.delta > 0 else 3
+        self.canvas.yview_scroll(steps, "units")
@@ -0,0 +1,147 @@
+"""Offline-first sync between the Tk kiosk and the Flask attendance server.
+
+Check-ins go to a local outbox first; a background thread pushes it to
+``/api/sync``. Event ids make retries safe. Kept to the standard library so the
+PyInstaller build needs nothing extra.
+"""
+import json
+import os
+import queue
+import threading
+import urllib.error
+import urllib.request
+import uuid
+
+MAX_BACKOFF = 60.0  # seconds between retries while the server is unreachable
+
+
+class SyncClient:
+    def __init__(self, base_url, pin, kiosk_id, outbox_file, interval=5.0, batch_size=200, timeout=5.0):
+        self.base_url = base_url.rstrip("/")
+        self.pin = pin
+        self.kiosk_id = kiosk_id
+        self.outbox_file = outbox_file
+        self.interval = interval
+        self.batch_size = batch_size
+        self.timeout = timeout
+
+        # ("roster", {id: name}) / ("present", {"date": ..., "present": [names]}),
+        # drained on the Tk thread because widgets must not be touched from here
+        self.updates = queue.Queue()
+        self.online = False
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._etags = {}
+        self._thread = None
+        self._pending = self._load_outbox()
+
+    # ---------- Outbox ----------
+    def _load_outbox(self):
+        pending = []
+        try:
+            with open(self.outbox_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        pending.append(json.loads(line))
+                    except ValueError:
+                        pass  # torn last line from a power cut; the rest is still good
+        except FileNotFoundError:
+            pass
+        return pending
+
+    def _rewrite_outbox(self):
+        # Caller holds self._lock
+        tmp = self.outbox_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for event in self._pending:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.outbox_file)
+
+    def record(self, kind, **fields):
+        """Durably queue an event ("checkin", "student_add", "student_delete") and return it."""
+        event = dict(fields, id="%s-%s" % (self.kiosk_id, uuid.uuid4().hex), type=kind)
+        with self._lock:
+            with open(self.outbox_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._pending.append(event)
+        self._wake.set()
+        return event
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    # ---------- Worker ----------
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="kiosk-sync", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=2.0):
+        # Whatever is not pushed yet stays in the outbox for next start
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        delay = self.interval
+        while not self._stop.is_set():
+            try:
+                self._push()
+                self._pull("/api/students", "roster")
+                self._pull("/api/sync/today", "present")
+                self.online = True
+                delay = self.interval
+            except (urllib.error.URLError, OSError, ValueError):
+                self.online = False
+                delay = min(delay * 2, MAX_BACKOFF)
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def _request(self, path, body=None, etag=None):
+        headers = {"X-Admin-Pin": self.pin}
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        if etag:
+            headers["If-None-Match"] = etag
+        req = urllib.request.Request(self.base_url + path, data=data, headers=headers,
+                                     method="POST" if body is not None else "GET")
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                return resp.status, resp.headers.get("ETag"), json.loads(resp.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return 304, etag, None
+            raise
+
+    def _push(self):
+        while True:
+            with self._lock:
+                batch = self._pending[:self.batch_size]
+            if not batch:
+                return
+            _, _, result = self._request("/api/sync", body={"kiosk": self.kiosk_id, "events": batch})
+            acked = set(result.get("acked", []))
+            if not acked:
+                raise ValueError("server acknowledged nothing")
+            with self._lock:
+                self._pending = [ev for ev in self._pending if ev["id"] not in acked]
+                self._rewrite_outbox()
+
+    def _pull(self, path, kind):
+        status, etag, data = self._request(path, etag=self._etags.get(path))
+        if status == 200:
+            self._etags[path] = etag
+            self.updates.put((kind, data))
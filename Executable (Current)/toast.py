@@ -0,0 +1,46 @@
+"""Non-modal check-in messages for the Tk kiosk.
+
+A Toast is a banner drawn over the bottom of the kiosk window. It stays for a
+moment and then fades into the window background on its own; a new message
+replaces the current one straight away. Nothing has to be dismissed, so the
+next student can check in immediately.
+"""
+import tkinter as tk
+
+COLORS = {"ok": "#2e7d32", "warning": "#b26a00", "error": "#c62828"}
+FADE_STEPS = 12
+FADE_STEP_MS = 40
+
+
+class Toast:
+    def __init__(self, master, hold_ms=1800, font=("Arial", 20, "bold"), fg="white"):
+        self.master = master
+        self.hold_ms = hold_ms
+        self.fg = fg
+        self.label = tk.Label(master, font=font, fg=fg, padx=30, pady=14, wraplength=900)
+        self._job = None
+        self._colors = None  # (background, label bg, label fg) as RGB triples while fading
+
+    def show(self, text, kind="ok"):
+        if self._job is not None:
+            self.master.after_cancel(self._job)
+        bg = COLORS.get(kind, COLORS["ok"])
+        self.label.configure(text=text, bg=bg, fg=self.fg)
+        self.label.place(relx=0.5, rely=0.95, anchor="s")
+        self.label.lift()
+        self._colors = (self._rgb(self.master.cget("bg")), self._rgb(bg), self._rgb(self.fg))
+        self._job = self.master.after(self.hold_ms, self._fade, 1)
+
+    def _rgb(self, color):
+        return tuple(c // 257 for c in self.master.winfo_rgb(color))
+
+    def _fade(self, step):
+        if step > FADE_STEPS:
+            self.label.place_forget()
+            self._job = None
+            return
+        target, bg, fg = self._colors
+        t = step / FADE_STEPS
+        blend = lambda c: "#%02x%02x%02x" % tuple(int(a + (b - a) * t) for a, b in zip(c, target))
+        self.label.configure(bg=blend(bg), fg=blend(fg))
+        self._job = self.master.after(FADE_STEP_MS, self._fade, step + 1)
@@ -0,0 +1,316 @@
+"""Reading attendance CSVs from every version of the app.
+
+Two layouts exist (either may lack a header):
+
+    Date,Student ID,Name,Status   web server and the old Tk app
+    Date,Name,Status              current Tk app (no IDs)
+
+Rows come out as Records in the four-column layout. The ``.idx`` sidecar maps
+each date to the offset of its first row; append_rows() keeps it current.
+"""
+import csv
+import io
+import itertools
+import json
+import os
+from bisect import bisect_left
+from collections import namedtuple
+
+UNIFIED_HEADER = ["Date", "Student ID", "Name", "Status"]
+
+Record = namedtuple("Record", ["date", "sid", "name", "status"])
+
+
+def column_map(header):
+    # Map the unified fields onto this file's columns (None = column missing)
+    cols = [c.strip().lower() for c in header]
+    def find(*names):
+        for name in names:
+            if name in cols:
+                return cols.index(name)
+        return None
+    return find("date"), find("student id", "id"), find("name"), find("status")
+
+
+def _layout(first):
+    # (is first a header?, row -> Record or None) for a file whose first row is first
+    date_i, sid_i, name_i, status_i = column_map(first)
+    is_header = date_i is not None and name_i is not None
+    if not is_header:
+        # No header: guess from the width of the first row
+        date_i, sid_i, name_i, status_i = (0, 1, 2, 3) if len(first) >= 4 else (0, None, 1, 2)
+
+    def make(row):
+        if not row or not any(row):
+            return None
+        try:
+            return Record(
+                row[date_i].strip(),
+                row[sid_i].strip() if sid_i is not None else "",
+                row[name_i].strip(),
+                row[status_i].strip() if status_i is not None and status_i < len(row) else "Present",
+            )
+        except IndexError:
+            return None  # short/torn row
+    return is_header, make
+
+
+def read_records(f, header=None):
+    """Yield Records from an open text file in any of the known layouts.
+
+    Pass the file's header row when f has already been positioned past it.
+    """
+    reader = csv.reader(f)
+    first = header if header is not None else next(reader, None)
+    if first is None:
+        return
+    is_header, make = _layout(first)
+    rows = reader if is_header or header is not None else itertools.chain([first], reader)
+    for row in rows:
+        rec = make(row)
+        if rec is not None:
+            yield rec
+
+
+class LogTail:
+    """Follows a log as it grows, for the indexes kept over it in memory.
+
+    read() parses only the complete rows written since the last call, by
+    this or any other process; a half-written last line waits for the next
+    one. It returns None if the file was replaced or got shorter: restart()
+    and read again from the top.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.restart()
+
+    def restart(self, offset=0):
+        self.ident = None     # (dev, inode) of the file being followed, once opened
+        self.offset = offset  # bytes read so far, always at the start of a line
+        self.header = None    # the first row (a data row in a header-less log)
+        self.data_start = 0   # offset just past the header line, if there is one
+        self._make = None
+
+    def read(self):
+        """[(offset, length, Record)] for the rows added since the last call, or None (see above)."""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return None if self.ident is not None else []
+        with f:
+            st = os.fstat(f.fileno())
+            if self.ident is None:
+                self.ident = (st.st_dev, st.st_ino)
+            elif (st.st_dev, st.st_ino) != self.ident or st.st_size < self.offset:
+                return None
+            out = []
+            if self._make is None:
+                first = f.readline()
+                if not first.endswith(b"\n"):
+                    return out
+                self.header = next(csv.reader([first.decode("utf-8-sig", "replace")]), None) or []
+                is_header, self._make = _layout(self.header)
+                self.data_start = len(first) if is_header else 0
+                if self.offset == 0:
+                    self.offset = self.data_start
+            f.seek(self.offset)
+            data = f.read(st.st_size - self.offset)
+        start = 0
+        while True:
+            end = data.find(b"\n", start) + 1
+            if not end:
+                break
+            line = data[start:end].decode("utf-8-sig" if self.offset + start == 0 else "utf-8", "replace")
+            rec = self._make(next(csv.reader([line]), None))
+            if rec is not None:
+                out.append((self.offset + start, end - start, rec))
+            start = end
+        self.offset += start
+        return out
+
+
+def open_log(path):
+    # utf-8-sig: logs saved back from Excel start with a BOM
+    return open(path, "r", encoding="utf-8-sig", newline="")
+
+
+def load_name_index(roster_path):
+    """{lowercased name: student id} from a students.json; names used twice are left out."""
+    with open(roster_path, "r", encoding="utf-8") as f:
+        roster = json.load(f)
+    if not isinstance(roster, dict):
+        return {}  # Tk rosters are plain name lists with no IDs
+    index, ambiguous = {}, set()
+    for sid, name in roster.items():
+        key = " ".join(name.split()).lower()
+        if key in index and index[key] != sid:
+            ambiguous.add(key)
+        index[key] = sid
+    for key in ambiguous:
+        del index[key]
+    return index
+
+
+# ---------- Date Offset Index ----------
+class DateIndex:
+    """Sidecar index of the byte offset where each date's rows start.
+
+    The sidecar records how many bytes of the log it covers. On load that is
+    checked against the file: a shorter file (rewritten or truncated) or a
+    last entry that no longer points at its date means the index is stale and
+    it is rebuilt; a longer file (rows appended by something that doesn't
+    maintain the index) is caught up by scanning just the new tail.
+
+    Entries are only added when a row's date is newer than every date before
+    it, so everything before offsets[i] is dated before dates[i]. That keeps
+    seeking correct even after a late row (say, an offline kiosk syncing
+    yesterday); such rows only mean a reader can't stop early at its end date.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.idx_path = path + ".idx"
+        self._reset()
+
+    def _reset(self):
+        self.dates = []      # ascending
+        self.offsets = []    # byte offset of the first row of dates[i]
+        self.data_start = 0  # offset just past the header line
+        self.covered = 0     # bytes of the log described by this index
+        self.in_order = True  # False once a row has been appended out of date order
+        self.dirty = True
+
+    @classmethod
+    def load(cls, path):
+        index = cls(path)
+        try:
+            with open(index.idx_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            index.dates = [d for d, _ in data["dates"]]
+            index.offsets = [o for _, o in data["dates"]]
+            index.data_start = data["data_start"]
+            index.covered = data["covered"]
+            index.in_order = data.get("in_order", True)
+            index.dirty = False
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            index._reset()
+        index.verify()
+        return index
+
+    def verify(self):
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if size < self.covered or not self._spot_check():
+            self._reset()
+        if size > self.covered:
+            self._scan()
+        if self.dirty:
+            self.save()
+        return self
+
+    def _spot_check(self):
+        if not self.offsets:
+            return True
+        with open(self.path, "rb") as f:
+            f.seek(self.offsets[-1])
+            return f.readline().startswith(self.dates[-1].encode("utf-8") + b",")
+
+    def _scan(self):
+        # Index the rows from self.covered on
+        tail = LogTail(self.path)
+        tail.restart(self.covered)
+        for offset, _, rec in tail.read() or []:
+            self.add(rec.date, offset)
+        self.data_start = tail.data_start
+        self.covered = tail.offset
+        self.dirty = True
+
+    def add(self, date, offset):
+        if not date:
+            return
+        if self.dates and date <= self.dates[-1]:
+            if date < self.dates[-1]:
+                self.in_order = False
+                self.dirty = True
+            return
+        self.dates.append(date)
+        self.offsets.append(offset)
+        self.dirty = True
+
+    def offset_of(self, date):
+        """Byte offset before which every row is dated before date."""
+        i = bisect_left(self.dates, date)
+        return self.offsets[i] if i < len(self.offsets) else self.covered
+
+    def save(self):
+        tmp = self.idx_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"covered": self.covered, "data_start": self.data_start, "in_order": self.in_order,
+                       "dates": [[d, o] for d, o in zip(self.dates, self.offsets)]}, f)
+        os.replace(tmp, self.idx_path)
+        self.dirty = False
+
+
+_indexes = {}  # path -> DateIndex, so repeat readers in one process skip reloading the sidecar
+
+def date_index(path):
+    index = _indexes.get(path)
+    if index is None:
+        index = _indexes[path] = DateIndex.load(path)
+    else:
+        index.verify()
+    return index
+
+
+def reset_index(path):
+    """Forget the index of a log that was rewritten or truncated; it is rebuilt on next use."""
+    _indexes.pop(path, None)
+    try:
+        os.remove(path + ".idx")
+    except FileNotFoundError:
+        pass
+
+
+def records_between(path, start=None, end=None):
+    """Yield Records dated start..end (inclusive ISO dates, either may be None).
+
+    Seeks to the first row of start via the date index and, unless the log
+    has late rows, stops at the first row after end, so only the requested
+    range is parsed.
+    """
+    if not os.path.exists(path):
+        return
+    index = date_index(path)
+    with open(path, "rb") as raw:
+        header = next(csv.reader([raw.readline().decode("utf-8-sig")]), None)
+        if header is None:
+            return
+        if start:
+            raw.seek(index.offset_of(start))
+        f = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        for rec in read_records(f, header):
+            if start and rec.date < start:
+                continue
+            if end and rec.date > end:
+                if index.in_order:
+                    return
+                continue
+            yield rec
+
+
+def append_rows(path, rows):
+    """Append CSV rows (oldest first) and record any new dates in the index."""
+    index = date_index(path)
+    with open(path, "ab") as f:
+        offset = f.seek(0, os.SEEK_END)
+        for row in rows:
+            buf = io.StringIO()
+            csv.writer(buf).writerow(row)
+            data = buf.getvalue().encode("utf-8")
+            if offset == index.covered:
+                index.add(row[0], offset)
+                index.covered = offset + len(data)
+            f.write(data)
+            offset += len(data)
+    if index.dirty:
+        index.save()
@@ -0,0 +1,209 @@
+"""Bitmap index of who was Present on which meeting day.
+
+Meeting days are the days with any row plus the calendar's days up to today,
+so a meeting nobody came to still counts. refresh() reads only appended rows.
+"""
+import datetime
+import os
+import threading
+from bisect import bisect_left, bisect_right
+
+from attendance_log import LogTail
+from meetings import calendar_path, load_calendar, meeting_days
+from seasons import DEFAULT_START, list_seasons, missed, season_of, season_records
+
+
+def _iso(text):
+    try:
+        return datetime.date.fromisoformat(text.strip()).isoformat()
+    except ValueError:
+        raise ValueError(f"expected a date like 2025-10-04, not {text.strip()!r}") from None
+
+
+def popcount(bits):
+    return bin(bits).count("1")
+
+
+def members(bits):
+    """Indexes of the set bits, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class AttendanceBitmaps:
+    def __init__(self, log_path, key=None, season_start=DEFAULT_START):
+        self.log_path = log_path
+        self.key = key or (lambda rec: rec.sid or rec.name)
+        self.season_start = season_start
+        self._lock = threading.RLock()
+        self.calendar_path = calendar_path(log_path)
+        self.tail = LogTail(log_path)
+        self.calendar_stamp = None
+        self._reset()
+
+    def _reset(self):
+        self.tail.restart()
+        self.calendar = None
+        self.through = None     # calendar days up to this date are in days
+        self.days = []          # meeting days (ISO dates), ascending; position = day ordinal
+        self.by_day = []        # day ordinal -> bitset of student numbers Present
+        self.students = []      # student number -> key
+        self.numbers = {}       # key -> student number
+        self.names = {}         # key -> latest name seen
+        self.by_student = []    # student number -> bitset of day ordinals Present
+        self.joined = {}        # (season, key) -> date of the student's first row that season
+
+    # ---------- Building ----------
+    def _student(self, key):
+        n = self.numbers.get(key)
+        if n is None:
+            n = self.numbers[key] = len(self.students)
+            self.students.append(key)
+            self.by_student.append(0)
+        return n
+
+    def _day(self, date_iso):
+        i = bisect_left(self.days, date_iso)
+        if i < len(self.days) and self.days[i] == date_iso:
+            return i
+        if i < len(self.days):
+            # A late day lands before existing ones: shift the later ordinals up one
+            low = (1 << i) - 1
+            self.by_student = [(b & low) | ((b & ~low) << 1) for b in self.by_student]
+        self.days.insert(i, date_iso)
+        self.by_day.insert(i, 0)
+        return i
+
+    def add(self, rec):
+        if not rec.date:
+            return
+        d = self._day(rec.date)  # any row (Present or not) makes its date a meeting day
+        key = self.key(rec)
+        n = self._student(key)
+        if rec.name:
+            self.names[key] = rec.name
+        season = (season_of(rec.date, self.season_start), key)
+        self.joined[season] = min(self.joined.get(season, rec.date), rec.date)
+        if rec.status == "Present":
+            self.by_day[d] |= 1 << n
+            self.by_student[n] |= 1 << d
+
+    def _calendar_stamp(self):
+        try:
+            info = os.stat(self.calendar_path)
+        except FileNotFoundError:
+            return None
+        return info.st_mtime_ns, info.st_size
+
+    def _add_calendar(self, today):
+        for day in meeting_days(self.calendar, self.through and self._next(self.through), today):
+            self._day(day)
+        self.through = today
+
+    def _next(self, date_iso):
+        return (datetime.date.fromisoformat(date_iso) + datetime.timedelta(days=1)).isoformat()
+
+    def refresh(self):
+        """Index the rows appended since the last call; rebuild if the log or calendar was replaced."""
+        with self._lock:
+            if not os.path.exists(self.log_path):
+                return self
+            stamp = self._calendar_stamp()
+            rows = self.tail.read() if self.tail.ident is not None and stamp == self.calendar_stamp else None
+            if rows is None:
+                self._reset()
+                self.calendar_stamp = stamp
+                self.calendar = load_calendar(self.calendar_path)
+                for label in list_seasons(self.log_path):
+                    for rec in season_records(self.log_path, label):
+                        self.add(rec)
+                rows = self.tail.read()
+            today = datetime.date.today().isoformat()
+            if self.through != today:
+                self._add_calendar(today)  # a scheduled day becomes a meeting day once it arrives
+            for _, _, rec in rows:
+                self.add(rec)
+        return self
+
+    # ---------- Queries ----------
+    def days_in(self, spec):
+        """Meeting days named by "2025-10-04,2025-10-11" and/or ranges like "2025-10-06..2025-10-12".
+
+        Raises ValueError for a malformed date, a named day that wasn't a
+        meeting day or a range with no meeting days in it.
+        """
+        days = []
+        for part in spec.split(","):
+            part = part.strip()
+            if ".." in part:
+                start, end = (_iso(p) for p in part.split("..", 1))
+                found = self.days[bisect_left(self.days, start):bisect_right(self.days, end)]
+                if not found:
+                    raise ValueError(f"no meeting days in {part}")
+                days.extend(found)
+            elif part:
+                day = _iso(part)
+                i = bisect_left(self.days, day)
+                if i == len(self.days) or self.days[i] != day:
+                    raise ValueError(f"{day} was not a meeting day")
+                days.append(day)
+        return days
+
+    def days_between(self, start, end):
+        """Meeting days from start to end, inclusive."""
+        with self._lock:
+            return self.days[bisect_left(self.days, start):bisect_right(self.days, end)]
+
+    def missed_on(self, date_iso, among):
+        """Keys of students in among (see mask()) who missed date_iso, by the rule in seasons.missed."""
+        with self._lock:
+            season = season_of(date_iso, self.season_start)
+            return [key for key in self.keys(among & ~self.day_bits(date_iso))
+                    if missed((date_iso,), (), self.joined.get((season, key)))]
+
+    def day_bits(self, date_iso):
+        i = bisect_left(self.days, date_iso)
+        return self.by_day[i] if i < len(self.days) and self.days[i] == date_iso else 0
+
+    def mask(self, keys):
+        """Bitset of the given students (say, the current roster), numbering any never seen."""
+        with self._lock:
+            bits = 0
+            for key in keys:
+                bits |= 1 << self._student(key)
+            return bits
+
+    def select(self, all_of=(), any_of=(), none_of=(), among=None):
+        """Students Present on every day in all_of, on at least one in any_of and on none of none_of.
+
+        among limits the answer to a bitset of students (see mask()); without
+        it, every student in the index is a candidate.
+        """
+        with self._lock:
+            bits = among if among is not None else (1 << len(self.students)) - 1
+            for day in all_of:
+                bits &= self.day_bits(day)
+            if any_of:
+                either = 0
+                for day in any_of:
+                    either |= self.day_bits(day)
+                bits &= either
+            for day in none_of:
+                bits &= ~self.day_bits(day)
+            return bits
+
+    def keys(self, bits):
+        return [self.students[n] for n in members(bits)]
+
+    def attended(self, key, start=None, end=None):
+        """(meetings attended, meeting days) for a student between two ISO dates, inclusive."""
+        with self._lock:
+            lo = bisect_left(self.days, start) if start else 0
+            hi = bisect_right(self.days, end) if end else len(self.days)
+            if hi <= lo:
+                return 0, 0
+            n = self.numbers.get(key)
+            bits = self.by_student[n] if n is not None else 0
+            return popcount((bits >> lo) & ((1 << (hi - lo)) - 1)), hi - lo
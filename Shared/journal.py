@@ -0,0 +1,298 @@
+"""Write-ahead journal and snapshots for attendance.csv and the roster.
+
+Only the last journal entry can be incomplete; recover() redoes it, but a torn
+append is redone only if the log is still the file it was written against.
+refresh() never replays the journal: a replaced or shortened log is counted
+again. Snapshots record the log offset they cover, so startup reads only the
+rows after it.
+"""
+import contextlib
+import csv
+import io
+import json
+import os
+import threading
+
+from attendance_log import LogTail, append_rows, reset_index
+
+JOURNAL_MAX_BYTES = 256 * 1024
+TAIL_CHECK_BYTES = 64  # log bytes just before the covered offset, kept to spot a replaced file
+
+
+def write_atomic(path, data):
+    """Replace path with data (bytes) so readers see the old or the new file, never half of one."""
+    tmp = "%s.%d.tmp" % (path, os.getpid())
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _roster_bytes(roster):
+    return json.dumps(roster, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+class Journal:
+    def __init__(self, log_path, roster_path, lock=None, key=None):
+        self.log_path = log_path
+        self.roster_path = roster_path
+        self.journal_path = log_path + ".journal"
+        self.snapshot_path = log_path + ".snapshot"
+        self.lock = lock or contextlib.nullcontext  # cross-process lock, e.g. Web1.locked
+        self.key = key or (lambda rec: rec.sid or rec.name)
+        self._mutex = threading.RLock()
+        self.tail = LogTail(log_path)  # how far into which file the state below reaches
+        self._reset()
+
+    @property
+    def covered(self):
+        """Bytes of the log reflected in the state."""
+        return self.tail.offset
+
+    def _reset(self):
+        self.tail.restart()
+        self.last_date = ""  # newest date seen
+        self.present = {}    # student -> number of Present rows on last_date
+        self.counts = {}     # student -> number of Present rows
+        self.snapshot_covered = None
+
+    # ---------- Derived State ----------
+    def _count(self, rec, sign=1):
+        if rec.status != "Present" or not rec.date:
+            return
+        key = self.key(rec)
+        self.counts[key] = self.counts.get(key, 0) + sign
+        if self.counts[key] <= 0:
+            del self.counts[key]
+        if rec.date > self.last_date:
+            self.last_date, self.present = rec.date, {}
+        if rec.date == self.last_date:
+            self.present[key] = self.present.get(key, 0) + sign
+            if self.present[key] <= 0:
+                del self.present[key]
+
+    def _scan(self):
+        # Count the rows appended since the last scan; False if the log was replaced or cut short
+        rows = self.tail.read()
+        for _, _, rec in rows or ():
+            self._count(rec)
+        return rows is not None
+
+    def refresh(self):
+        """Bring the state up to date with the log (which other processes may have appended to)."""
+        with self._mutex:
+            if self.tail.ident is not None and self._scan():
+                return self
+        with self.lock(), self._mutex:
+            self._reload()  # replaced or edited by hand: count it again, don't replay the journal
+        return self
+
+    def present_on(self, date_iso):
+        """Students Present on date_iso, or None if that date is older than the state keeps."""
+        self.refresh()
+        if date_iso == self.last_date:
+            return set(self.present)
+        if date_iso > self.last_date:
+            return set()
+        return None
+
+    # ---------- Recovery ----------
+    def recover(self):
+        """Finish an interrupted change, then load the snapshot and read the log past it."""
+        with self.lock(), self._mutex:
+            self._reload(full_scan=self._redo_last())
+        return self
+
+    def _reload(self, full_scan=False):
+        self._reset()
+        if not full_scan:
+            self._load_snapshot()
+        if os.path.exists(self.log_path):
+            self._scan()
+        if self.covered != self.snapshot_covered:
+            self.snapshot()
+
+    def _load_snapshot(self):
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snap = json.load(f)
+            covered, tail = snap["covered"], snap["tail"].encode("latin-1")
+            with open(self.log_path, "rb") as f:
+                f.seek(max(0, covered - len(tail)))
+                if f.read(len(tail)) != tail or os.fstat(f.fileno()).st_size < covered:
+                    return  # the log was replaced or edited behind our back: count from the top
+            self.tail.restart(covered)
+            self.snapshot_covered = covered
+            self.last_date = snap["last_date"]
+            self.present = dict(snap["present_rows"])
+            self.counts = dict(snap["counts"])
+        except (FileNotFoundError, ValueError, KeyError, TypeError, AttributeError):
+            self._reset()
+
+    def _last_entry(self):
+        try:
+            with open(self.journal_path, "rb") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return None
+        if not lines:
+            return None
+        try:
+            return json.loads(lines[-1].decode("utf-8"))
+        except ValueError:
+            return None  # torn entry: its change was never started, everything before it completed
+
+    def _redo_last(self):
+        # Returns True if the log was rewritten, so the snapshot can't be trusted
+        entry = self._last_entry()
+        if entry is None:
+            return False
+        op = entry.get("op")
+        if op == "roster":
+            roster = entry["roster"]
+            try:
+                with open(self.roster_path, "r", encoding="utf-8") as f:
+                    current = json.load(f)
+            except (FileNotFoundError, ValueError):
+                current = None
+            if current != roster:
+                write_atomic(self.roster_path, _roster_bytes(roster))
+            return False
+        size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        if op == "append" and size < entry["size"]:
+            if not self._same_prefix(entry):
+                return True  # not the log this append was cut off in: leave it alone
+            if size > entry["at"]:
+                with open(self.log_path, "r+b") as f:
+                    f.truncate(entry["at"])  # drop the torn row(s) and write them again
+                reset_index(self.log_path)
+            append_rows(self.log_path, entry["rows"])
+        elif op == "rewrite":
+            if size == entry["before"]:
+                self._apply_rewrite([tuple(r) for r in entry["remove"]])
+            return True
+        return False
+
+    def _same_prefix(self, entry):
+        # Is the log the file the append was journaled against, unchanged up to entry["at"]?
+        try:
+            with open(self.log_path, "rb") as f:
+                st = os.fstat(f.fileno())
+                tail = entry["tail"].encode("latin-1")
+                f.seek(max(0, entry["at"] - len(tail)))
+                return ([st.st_dev, st.st_ino] == entry["ident"] and st.st_size >= entry["at"]
+                        and f.read(len(tail)) == tail)
+        except (FileNotFoundError, KeyError, AttributeError):
+            return False
+
+    # ---------- Changes ----------
+    def _write_entry(self, entry):
+        with open(self.journal_path, "ab") as f:
+            f.write(json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
+
+    def _after_change(self, journal_size):
+        if journal_size > JOURNAL_MAX_BYTES:
+            self.snapshot()
+
+    def append(self, rows):
+        """Journal, then append CSV rows (oldest first) to the log."""
+        rows = [list(r) for r in rows]
+        if not rows:
+            return
+        with self.lock(), self._mutex:
+            self.refresh()
+            with open(self.log_path, "rb") as f:
+                st = os.fstat(f.fileno())
+                at = st.st_size
+                f.seek(max(0, at - TAIL_CHECK_BYTES))
+                tail = f.read()
+            data = sum(len(self._csv_line(r)) for r in rows)
+            journal_size = self._write_entry({"op": "append", "at": at, "size": at + data, "rows": rows,
+                                              "ident": [st.st_dev, st.st_ino], "tail": tail.decode("latin-1")})
+            append_rows(self.log_path, rows)
+            self._scan()
+            self._after_change(journal_size)
+
+    def _csv_line(self, row):
+        buf = io.StringIO()
+        csv.writer(buf).writerow(row)
+        return buf.getvalue().encode("utf-8")
+
+    def rows(self):
+        """Yield (offset, length, Record) for every complete row of the log.
+
+        Call it under self.lock() if the offsets are going to be used for a change.
+        """
+        self.refresh()
+        yield from LogTail(self.log_path).read() or ()
+
+    def remove(self, match, limit=None):
+        """Delete log rows whose Record satisfies match (at most limit); returns the removed Records."""
+        with self.lock(), self._mutex:
+            removed = []
+            for offset, length, rec in self.rows():
+                if match(rec):
+                    removed.append((offset, length, rec))
+                    if limit is not None and len(removed) >= limit:
+                        break
+            if not removed:
+                return []
+            with open(self.log_path, "rb") as f:
+                data = f.read()
+            spans = [(offset, length) for offset, length, _ in removed]
+            self._write_entry({"op": "rewrite", "before": len(data),
+                               "size": len(data) - sum(n for _, n in spans), "remove": spans})
+            self._apply_rewrite(spans, data)
+            for offset, length, rec in removed:
+                if offset < self.covered:
+                    self.tail.offset -= length
+                    self._count(rec, -1)
+            st = os.stat(self.log_path)
+            self.tail.ident = (st.st_dev, st.st_ino)  # the rewrite is a new file with the same rows otherwise
+            self.snapshot()
+            return [rec for _, _, rec in removed]
+
+    def _apply_rewrite(self, spans, data=None):
+        if data is None:
+            with open(self.log_path, "rb") as f:
+                data = f.read()
+        parts, pos = [], 0
+        for offset, length in sorted(spans):
+            parts.append(data[pos:offset])
+            pos = offset + length
+        parts.append(data[pos:])
+        write_atomic(self.log_path, b"".join(parts))
+        reset_index(self.log_path)
+
+    def save_roster(self, roster):
+        """Journal, then atomically replace the roster file."""
+        with self.lock(), self._mutex:
+            journal_size = self._write_entry({"op": "roster", "roster": roster})
+            write_atomic(self.roster_path, _roster_bytes(roster))
+            self._after_change(journal_size)
+
+    # ---------- Snapshots ----------
+    def snapshot(self):
+        """Save the derived state and start a new journal."""
+        with self.lock(), self._mutex:
+            if self.tail.ident is None:
+                return
+            with open(self.log_path, "rb") as f:
+                f.seek(max(0, self.covered - TAIL_CHECK_BYTES))
+                tail = f.read(self.covered - f.tell())
+            snap = {"covered": self.covered, "tail": tail.decode("latin-1"),
+                    "last_date": self.last_date, "present_rows": self.present, "counts": self.counts}
+            write_atomic(self.snapshot_path, json.dumps(snap, ensure_ascii=False).encode("utf-8"))
+            self.snapshot_covered = self.covered
+            # Everything journaled so far is in the files and the snapshot now
+            with open(self.journal_path, "wb") as f:
+                os.fsync(f.fileno())
+
+    def close(self):
+        if self.tail.ident is not None:
+            self.refresh()
+            self.snapshot()
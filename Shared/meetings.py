@@ -0,0 +1,182 @@
+"""Meeting calendar (``meetings.json``): the days the team meets.
+
+    {"weekly": [{"days": ["Tue", "Thu"], "from": "2025-09-02", "to": ""}],
+     "dates": ["2025-10-04"], "cancelled": ["2025-11-27"]}
+
+Absences are worked out from it, never written. Logs from older versions that
+still hold Absent rows are converted with:
+
+    python meetings.py migrate "../Web Server/attendance.csv"
+"""
+import argparse
+import datetime
+import json
+import os
+
+from file_lock import FileLock
+from journal import Journal, write_atomic
+
+MEETINGS_FILE = "meetings.json"
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def calendar_path(log_path):
+    return os.path.join(os.path.dirname(os.path.abspath(log_path)), MEETINGS_FILE)
+
+
+def empty_calendar():
+    return {"weekly": [], "dates": [], "cancelled": []}
+
+
+def _iso(value):
+    return datetime.date.fromisoformat(str(value).strip()).isoformat()
+
+
+def check_calendar(cal):
+    """A cleaned-up copy of cal; raises ValueError for a bad date or weekday."""
+    if not isinstance(cal, dict):
+        raise ValueError("the calendar must be a JSON object")
+    out = empty_calendar()
+    for entry in cal.get("weekly") or []:
+        days = {str(d).strip()[:3].title() for d in entry.get("days") or []}
+        if not days or not days <= set(WEEKDAYS):
+            raise ValueError(f"weekly days must be some of {', '.join(WEEKDAYS)}, not {entry.get('days')!r}")
+        if not entry.get("from"):
+            raise ValueError("every weekly schedule needs a from date")
+        out["weekly"].append({"days": sorted(days, key=WEEKDAYS.index), "from": _iso(entry["from"]),
+                              "to": _iso(entry["to"]) if entry.get("to") else ""})
+    out["dates"] = sorted({_iso(d) for d in cal.get("dates") or []})
+    out["cancelled"] = sorted({_iso(d) for d in cal.get("cancelled") or []})
+    return out
+
+
+def load_calendar(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return check_calendar(json.load(f))
+    except (FileNotFoundError, ValueError):
+        return empty_calendar()
+
+
+def save_calendar(path, cal):
+    cal = check_calendar(cal)
+    write_atomic(path, json.dumps(cal, indent=2).encode("utf-8"))
+    return cal
+
+
+# ---------- Schedules as Text ----------
+# One weekly schedule per line, as the admin screens show them: "Tue,Thu 2025-09-02..2026-06-15"
+def format_weekly(entry):
+    return f"{','.join(entry['days'])} {entry['from']}..{entry['to']}"
+
+
+def parse_weekly(line):
+    try:
+        days, span = line.split()
+        start, end = span.split("..")
+    except ValueError:
+        raise ValueError(f"expected something like 'Tue,Thu 2025-09-02..2026-06-15', not {line!r}")
+    return {"days": days.split(","), "from": start, "to": end}
+
+
+def parse_dates(text):
+    return [part.strip() for part in text.replace("\n", ",").split(",") if part.strip()]
+
+
+# ---------- Meeting Days ----------
+def is_meeting(cal, date_iso):
+    if date_iso in cal["cancelled"]:
+        return False
+    if date_iso in cal["dates"]:
+        return True
+    weekday = WEEKDAYS[datetime.date.fromisoformat(date_iso).weekday()]
+    return any(weekday in e["days"] and e["from"] <= date_iso and (not e["to"] or date_iso <= e["to"])
+               for e in cal["weekly"])
+
+
+def meeting_days(cal, start, end):
+    """Meeting days between two ISO dates (inclusive; start None = the calendar's first), ascending."""
+    days = {d for d in cal["dates"] if (start is None or start <= d) and d <= end}
+    for entry in cal["weekly"]:
+        lo = max(start or entry["from"], entry["from"])
+        hi = min(end, entry["to"]) if entry["to"] else end
+        if lo > hi:
+            continue
+        day, last = datetime.date.fromisoformat(lo), datetime.date.fromisoformat(hi)
+        wanted = {WEEKDAYS.index(d) for d in entry["days"]}
+        while day <= last:
+            if day.weekday() in wanted:
+                days.add(day.isoformat())
+            day += datetime.timedelta(days=1)
+    return sorted(days - set(cal["cancelled"]))
+
+
+def add_meeting(cal, date_iso):
+    """Copy of cal with date_iso made a meeting day (a one-off unless a schedule already covers it)."""
+    cal = check_calendar(cal)
+    cal["cancelled"] = [d for d in cal["cancelled"] if d != date_iso]
+    if not is_meeting(cal, date_iso):
+        cal["dates"] = sorted(cal["dates"] + [date_iso])
+    return cal
+
+
+def absent_on(cal, date_iso, roster, present):
+    """Roster students (keys, in roster order) missing on date_iso; none if it isn't a meeting day."""
+    if not is_meeting(cal, date_iso):
+        return []
+    return [key for key in roster if key not in present]
+
+
+# ---------- Migration ----------
+def drop_absent_rows(journal, roster):
+    """Add the days of logged Absent rows to the calendar, then drop the rows it now implies.
+
+    Absent rows of students who have left the roster are kept, since nothing
+    else records them. Returns (rows dropped, days added to the calendar).
+    """
+    keys = set(roster)  # IDs for the web server's roster, names for the kiosk's
+    path = calendar_path(journal.log_path)
+    with journal.lock():
+        cal = load_calendar(path)
+        dates = {rec.date for _, _, rec in journal.rows() if rec.status == "Absent" and rec.date}
+        added = sorted(d for d in dates if not is_meeting(cal, d))
+        for date_iso in added:
+            cal = add_meeting(cal, date_iso)
+        if added:
+            save_calendar(path, cal)  # first, so a crash before the rewrite loses nothing
+        removed = journal.remove(lambda rec: rec.status == "Absent" and journal.key(rec) in keys)
+    return len(removed), added
+
+
+# ---------- Command Line ----------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Meeting calendar tools for an attendance log.")
+    sub = parser.add_subparsers(dest="command")
+    sub.required = True
+    p = sub.add_parser("migrate", help="move logged Absent rows into the meeting calendar")
+    p.add_argument("log")
+    p.add_argument("--roster", help="the app's students.json (default: next to the log)")
+    p = sub.add_parser("days", help="list meeting days")
+    p.add_argument("log")
+    p.add_argument("--from", dest="start", help="first date (default: the calendar's first)")
+    p.add_argument("--to", dest="end", help="last date (default: today)")
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        folder = os.path.dirname(os.path.abspath(args.log))
+        roster_path = args.roster or os.path.join(folder, "students.json")
+        with open(roster_path, "r", encoding="utf-8") as f:
+            roster = json.load(f)
+        lock = FileLock(os.path.join(folder, "attendance.lock"))  # waits for (and blocks) the apps' writes
+        journal = Journal(args.log, roster_path, lock=lambda: lock).recover()
+        dropped, added = drop_absent_rows(journal, roster)
+        journal.close()
+        print(f"Dropped {dropped} Absent rows; added {len(added)} meeting days to {calendar_path(args.log)}")
+    elif args.command == "days":
+        cal = load_calendar(calendar_path(args.log))
+        for day in meeting_days(cal, args.start, args.end or datetime.date.today().isoformat()):
+            print(day)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Merge attendance logs from any app version into one unified CSV.
+
+    python merge_logs.py -o merged.csv --roster "../Web Server/students.json" \
+        kiosk1/attendance.csv kiosk2/attendance.csv old/attendance.csv
+
+Every input is already in date order (the apps only append), so the inputs
+are combined with a k-way merge that holds one row per file in memory. Names
+are mapped to student IDs through the roster(s), and rows that are exact
+duplicates of one already written for the same day are dropped. Memory use is
+one row per input plus one day's worth of rows for duplicate detection, no
+matter how many years of logs go in.
+"""
+import argparse
+import csv
+import heapq
+import sys
+from contextlib import ExitStack
+
+from attendance_log import UNIFIED_HEADER, Record, load_name_index, open_log, read_records
+
+
+class MergeStats:
+    def __init__(self):
+        self.read = 0
+        self.written = 0
+        self.duplicates = 0
+        self.mapped = 0        # rows that got their student ID from the roster
+        self.out_of_order = 0  # rows dated before an earlier row in the same file
+
+
+def _unify(records, names, stats):
+    last_date = ""
+    for rec in records:
+        stats.read += 1
+        if rec.date < last_date:
+            stats.out_of_order += 1
+        last_date = max(last_date, rec.date)
+        name = " ".join(rec.name.split())
+        sid = rec.sid
+        if not sid:
+            sid = names.get(name.lower(), "")
+            if sid:
+                stats.mapped += 1
+        yield Record(rec.date, sid, name, rec.status)
+
+
+def merge(files, names=None, stats=None):
+    """Yield unified, date-ordered, de-duplicated Records from open log files."""
+    names = names or {}
+    stats = stats if stats is not None else MergeStats()
+    streams = [_unify(read_records(f), names, stats) for f in files]
+    day, seen = None, set()
+    for rec in heapq.merge(*streams, key=lambda r: r.date):
+        if rec.date != day:
+            day, seen = rec.date, set()
+        key = (rec.sid, rec.name.lower(), rec.status)
+        if key in seen:
+            stats.duplicates += 1
+            continue
+        seen.add(key)
+        stats.written += 1
+        yield rec
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge attendance logs into one Date,Student ID,Name,Status CSV.")
+    parser.add_argument("logs", nargs="+", help="attendance CSVs in any app layout")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--roster", action="append", default=[],
+                        help="students.json used to fill in missing IDs (repeatable; later files win)")
+    args = parser.parse_args(argv)
+
+    names = {}
+    for path in args.roster:
+        names.update(load_name_index(path))
+
+    stats = MergeStats()
+    with ExitStack() as stack:
+        files = [stack.enter_context(open_log(path)) for path in args.logs]
+        if args.output:
+            out = stack.enter_context(open(args.output, "w", newline="", encoding="utf-8"))
+        else:
+            out = sys.stdout
+        writer = csv.writer(out)
+        writer.writerow(UNIFIED_HEADER)
+        for rec in merge(files, names, stats):
+            writer.writerow(rec)
+
+    print(f"Read {stats.read} rows from {len(args.logs)} files, wrote {stats.written}, "
+          f"dropped {stats.duplicates} duplicates, filled in {stats.mapped} IDs from the roster.",
+          file=sys.stderr)
+    if stats.out_of_order:
+        print(f"Warning: {stats.out_of_order} rows were out of date order in their file; "
+              "the output is only ordered as well as the inputs were.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
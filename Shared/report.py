@@ -0,0 +1,302 @@
+"""Attendance reports and upkeep from the command line, without Tk or Flask.
+
+    python report.py report "../Web Server/attendance.csv" --period day week season --format json
+    python report.py refresh "../Executable (Current)/data/attendance.csv"
+    python report.py nightly data/attendance.csv --to coach@example.org --smtp-host smtp.example.org
+
+The lock is held only to note the log's size, and only rows up to it are read.
+smtplib is imported only when mailing, to keep startup fast.
+"""
+import argparse
+import csv
+import datetime
+import io
+import json
+import os
+import sys
+
+import seasons
+from attendance_log import date_index, read_records
+from file_lock import FileLock
+from journal import Journal
+from meetings import calendar_path, load_calendar, meeting_days
+
+PERIODS = ("day", "week", "season")
+REPORT_HEADER = ["Period", "From", "To", "Student ID", "Name", "Present", "Absent", "Meeting Days"]
+
+
+def _folder_file(log_path, name):
+    return os.path.join(os.path.dirname(os.path.abspath(log_path)), name)
+
+
+def data_lock(log_path):
+    # The same lock file both apps use for their writes
+    return FileLock(_folder_file(log_path, "attendance.lock"))
+
+
+def load_roster(log_path):
+    """{key: name} from the students.json next to the log (names are their own keys in the kiosk's)."""
+    try:
+        with open(_folder_file(log_path, "students.json"), "r", encoding="utf-8") as f:
+            roster = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return dict(roster) if isinstance(roster, dict) else {name: name for name in roster}
+
+
+def configured_season_start(log_path):
+    try:
+        with open(_folder_file(log_path, "config.json"), "r", encoding="utf-8") as f:
+            return json.load(f).get("season_start") or seasons.DEFAULT_START
+    except (FileNotFoundError, ValueError, AttributeError):
+        return seasons.DEFAULT_START
+
+
+def period_bounds(period, date_iso, season_start, season=None):
+    """(first day, last day) of the day, week (Monday on) or season containing date_iso."""
+    if period == "day":
+        return date_iso, date_iso
+    if period == "week":
+        day = datetime.date.fromisoformat(date_iso)
+        monday = day - datetime.timedelta(days=day.weekday())
+        return monday.isoformat(), (monday + datetime.timedelta(days=6)).isoformat()
+    return seasons.season_bounds(season or seasons.season_of(date_iso, season_start), season_start)
+
+
+# ---------- Reading ----------
+def _log_records(log_path, start, lock):
+    # Rows from start on, up to the size the log had when it was opened under the lock
+    if not os.path.exists(log_path):
+        return
+    with lock:
+        index = date_index(log_path)
+        f = open(log_path, "rb")
+        size = os.fstat(f.fileno()).st_size
+    with f:
+        header = next(csv.reader([f.readline().decode("utf-8-sig")]), None)
+        if header is None:
+            return
+        pos = max(f.tell(), index.offset_of(start)) if start else f.tell()
+        f.seek(pos)
+
+        def lines():
+            offset = pos
+            for line in f:
+                offset += len(line)
+                if offset > size or not line.endswith(b"\n"):
+                    return  # appended after the report started
+                yield line.decode("utf-8", "replace")
+        yield from read_records(lines(), header)
+
+
+def stream_records(log_path, start, end, season_start, lock):
+    """Records dated start..end: the archives that reach into the range, then the live log."""
+    first, last = seasons.season_of(start, season_start), seasons.season_of(end, season_start)
+    for label in seasons.list_seasons(log_path):
+        if first <= label <= last:
+            for rec in seasons.season_records(log_path, label):
+                if start <= rec.date <= end:
+                    yield rec
+    for rec in _log_records(log_path, start, lock):
+        if rec.date <= end:
+            yield rec
+
+
+class Tally:
+    """One report period's Present days per student, filled in as rows stream past.
+
+    Rows from the start of the period's season are passed in too, so each
+    student's first row of the season (where absences start) is known.
+    """
+
+    def __init__(self, period, start, end, season_start):
+        self.period = period
+        self.start = start
+        self.end = end
+        self.season_first = seasons.season_bounds(seasons.season_of(end, season_start), season_start)[0]
+        self.days = set()     # dates with any row
+        self.present = {}     # student key -> dates Present
+        self.names = {}       # student key -> name
+        self.joined = {}      # student key -> first row of the season
+
+    def add(self, rec):
+        key = rec.sid or rec.name
+        self.joined[key] = min(self.joined.get(key, rec.date), rec.date)
+        if rec.date < self.start:
+            return
+        self.names[key] = rec.name or self.names.get(key, "")
+        self.days.add(rec.date)
+        if rec.status == "Present":
+            self.present.setdefault(key, set()).add(rec.date)
+
+    def rows(self, roster, calendar):
+        """(key, name, present, absent) per roster student plus anyone else seen, by name."""
+        days = self.days.union(meeting_days(calendar, self.start, self.end))
+        keys = set(roster) | set(self.names)
+        out = []
+        for key in keys:
+            here = self.present.get(key, set())
+            absent = len(seasons.missed(days, here, self.joined.get(key)))
+            out.append((key, roster.get(key) or self.names.get(key, key), len(here), absent))
+        out.sort(key=lambda row: row[1].lower())
+        return out, len(days)
+
+
+def build_reports(log_path, periods, date_iso, season_start, season=None, lock=None):
+    """Tallies for the requested periods, filled from a single pass over the rows."""
+    tallies = []
+    for period in periods:
+        start, end = period_bounds(period, date_iso, season_start, season)
+        # No absences for days still to come
+        tallies.append(Tally(period, start, min(end, date_iso), season_start))
+    start, end = min(t.season_first for t in tallies), max(t.end for t in tallies)
+    for rec in stream_records(log_path, start, end, season_start, lock or data_lock(log_path)):
+        for tally in tallies:
+            if tally.season_first <= rec.date <= tally.end:
+                tally.add(rec)
+    return tallies
+
+
+# ---------- Output ----------
+def write_csv(tallies, roster, calendar, out):
+    writer = csv.writer(out)
+    writer.writerow(REPORT_HEADER)
+    for tally in tallies:
+        rows, meetings = tally.rows(roster, calendar)
+        for key, name, present, absent in rows:
+            sid = key if key != name else ""
+            writer.writerow([tally.period, tally.start, tally.end, sid, name, present, absent, meetings])
+
+
+def write_json(tallies, roster, calendar, out):
+    out.write('{"reports":[')
+    for n, tally in enumerate(tallies):
+        rows, meetings = tally.rows(roster, calendar)
+        report = {"period": tally.period, "from": tally.start, "to": tally.end, "meeting_days": meetings,
+                  "students": [{"id": key if key != name else "", "name": name, "present": present, "absent": absent}
+                               for key, name, present, absent in rows]}
+        out.write(("," if n else "") + json.dumps(report, ensure_ascii=False))
+    out.write("]}\n")
+
+
+def summary_text(tallies, roster, calendar):
+    lines = []
+    for tally in tallies:
+        rows, meetings = tally.rows(roster, calendar)
+        span = tally.start if tally.start == tally.end else f"{tally.start} to {tally.end}"
+        lines.append(f"{tally.period.title()} ({span}): {meetings} meeting days")
+        if not meetings:
+            continue
+        here = sum(present for _, _, present, _ in rows)
+        lines.append(f"  average attendance: {here / meetings:.1f} students per meeting")
+        if tally.period == "day":
+            missing = [name for _, name, _, absent in rows if absent]
+            lines.append(f"  absent ({len(missing)}): " + (", ".join(missing) or "nobody"))
+        else:
+            low = [row for row in rows if row[2] * 2 < meetings]
+            if low:
+                lines.append(f"  at fewer than half the meetings ({len(low)}): " + ", ".join(r[1] for r in low))
+    return "\n".join(lines) + "\n"
+
+
+def send_email(args, subject, body, attachment):
+    import smtplib
+    from email.message import EmailMessage
+
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg["From"] = args.sender
+    msg["To"] = ", ".join(args.to)
+    msg.set_content(body)
+    msg.add_attachment(attachment.encode("utf-8"), maintype="text", subtype="csv",
+                       filename=f"attendance-{args.date}.csv")
+    smtp = smtplib.SMTP_SSL if args.ssl else smtplib.SMTP
+    with smtp(args.smtp_host, args.smtp_port or (465 if args.ssl else 25), timeout=30) as server:
+        if args.starttls:
+            server.starttls()
+        user = os.environ.get("SMTP_USER")
+        if user:
+            server.login(user, os.environ.get("SMTP_PASSWORD", ""))
+        server.send_message(msg)
+
+
+# ---------- Upkeep ----------
+def refresh(log_path):
+    """Bring the journal snapshot, date index and season summaries up to date; returns what was done."""
+    lock = data_lock(log_path)
+    done = []
+    with lock:
+        if not seasons.finish_pending(log_path):
+            raise RuntimeError(f"An earlier rollover did not finish cleanly; check {seasons.archive_folder(log_path)}")
+        if os.path.exists(log_path):
+            journal = Journal(log_path, _folder_file(log_path, "students.json"), lock=lambda: lock).recover()
+            journal.close()
+            done.append(f"snapshot covers {journal.covered} bytes")
+            done.append(f"date index covers {date_index(log_path).covered} bytes")
+    for label in seasons.list_seasons(log_path):
+        seasons.season_summary(log_path, label)
+        done.append(f"summary of {label} is current")
+    return done
+
+
+# ---------- Command Line ----------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Attendance reports and upkeep without the GUI.")
+    sub = parser.add_subparsers(dest="command")
+    sub.required = True
+    for name, text in (("report", "write reports as CSV or JSON"),
+                       ("email", "email a summary with the reports attached"),
+                       ("nightly", "refresh, then email"),
+                       ("refresh", "update the snapshot, date index and season summaries")):
+        p = sub.add_parser(name, help=text)
+        p.add_argument("log", help="the app's attendance.csv")
+        if name == "refresh":
+            continue
+        p.add_argument("--date", default=datetime.date.today().isoformat(), help="report as of this date (default today)")
+        p.add_argument("--period", nargs="+", choices=PERIODS, default=list(PERIODS))
+        p.add_argument("--season", help="season label for the season report (default: the one --date is in)")
+        p.add_argument("--season-start", help="MM-DD seasons begin on (default: config.json, else 01-01)")
+        if name == "report":
+            p.add_argument("--format", choices=("csv", "json"), default="csv")
+            p.add_argument("-o", "--output", help="output file (default: stdout)")
+        else:
+            p.add_argument("--to", nargs="+", required=True, help="recipient addresses")
+            p.add_argument("--from", dest="sender", default=os.environ.get("REPORT_FROM", "attendance@localhost"))
+            p.add_argument("--smtp-host", default=os.environ.get("SMTP_HOST", "localhost"))
+            p.add_argument("--smtp-port", type=int, default=int(os.environ.get("SMTP_PORT", 0)))
+            p.add_argument("--starttls", action="store_true")
+            p.add_argument("--ssl", action="store_true")
+    args = parser.parse_args(argv)
+    try:
+        if args.command != "refresh":
+            args.date = datetime.date.fromisoformat(args.date).isoformat()
+    except ValueError:
+        parser.error("--date must be YYYY-MM-DD")
+
+    if args.command in ("refresh", "nightly"):
+        for line in refresh(args.log):
+            print(line)
+        if args.command == "refresh":
+            return
+
+    season_start = args.season_start or configured_season_start(args.log)
+    tallies = build_reports(args.log, args.period, args.date, season_start, args.season)
+    roster = load_roster(args.log)
+    calendar = load_calendar(calendar_path(args.log))
+    if args.command == "report":
+        write = write_json if args.format == "json" else write_csv
+        if args.output:
+            with open(args.output, "w", newline="", encoding="utf-8") as out:
+                write(tallies, roster, calendar, out)
+        else:
+            write(tallies, roster, calendar, sys.stdout)
+        return
+
+    attachment = io.StringIO()
+    write_csv(tallies, roster, calendar, attachment)
+    send_email(args, f"Attendance for {args.date}", summary_text(tallies, roster, calendar), attachment.getvalue())
+    print(f"Sent to {', '.join(args.to)}")
+
+
+if __name__ == "__main__":
+    main()
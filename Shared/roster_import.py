@@ -0,0 +1,221 @@
+"""Bulk roster import shared by the Tk kiosk and the web server.
+
+Nothing is written here; callers save ``report.added``. Must stay importable
+without tkinter, PIL or Flask.
+"""
+import csv
+import itertools
+import json
+import re
+
+MAX_NAME = 100
+ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,32}$")
+
+# Header spellings seen in school exports, lowercased
+ID_COLUMNS = ("student id", "id", "student_id", "studentid", "student number", "student #")
+NAME_COLUMNS = ("name", "student name", "student", "full name")
+FIRST_COLUMNS = ("first name", "first", "firstname", "given name")
+LAST_COLUMNS = ("last name", "last", "lastname", "surname", "family name")
+
+
+class ImportReport:
+    def __init__(self):
+        self.added = []       # (sid or None, name) in file order
+        self.accepted = []    # (line, (sid or None, name)) as given, for the rows in added
+        self.unchanged = 0    # rows already on the roster exactly as given
+        self.conflicts = []   # (line, message): clashes with the roster or earlier rows
+        self.errors = []      # (line, message): rows that failed validation
+
+    @property
+    def ok(self):
+        return not self.conflicts and not self.errors
+
+    def summary(self):
+        return (f"{len(self.added)} new, {self.unchanged} already on the roster, "
+                f"{len(self.conflicts)} conflicts, {len(self.errors)} invalid rows")
+
+    def as_dict(self):
+        return {
+            "added": [{"id": sid, "name": name} for sid, name in self.added],
+            "unchanged": self.unchanged,
+            "conflicts": [{"line": line, "message": msg} for line, msg in self.conflicts],
+            "errors": [{"line": line, "message": msg} for line, msg in self.errors],
+        }
+
+
+def clean_name(name):
+    return " ".join(str(name or "").split())
+
+
+def _pick(header, choices):
+    for i, col in enumerate(header):
+        if col in choices:
+            return i
+    return None
+
+
+def _csv_rows(lines):
+    reader = csv.reader(lines)
+    first = next(reader, None)
+    if first is None:
+        return
+    header = [c.strip().lower() for c in first]
+    id_col = _pick(header, ID_COLUMNS)
+    name_col = _pick(header, NAME_COLUMNS)
+    first_col = _pick(header, FIRST_COLUMNS)
+    last_col = _pick(header, LAST_COLUMNS)
+    has_header = name_col is not None or (first_col is not None and last_col is not None)
+
+    def split(row):
+        if has_header:
+            cell = lambda i: row[i] if i is not None and i < len(row) else ""
+            if name_col is not None:
+                name = cell(name_col)
+            else:
+                name = cell(first_col) + " " + cell(last_col)
+            return cell(id_col) or None, name
+        # No recognizable header: "id,name" or just "name"
+        if len(row) >= 2:
+            return row[0] or None, row[1]
+        return None, row[0] if row else ""
+
+    if not has_header:
+        yield 1, split(first)
+    for row in reader:
+        if any(c.strip() for c in row):
+            yield reader.line_num, split(row)
+
+
+def _json_rows(data):
+    if isinstance(data, dict):
+        data = [{"id": sid, "name": name} for sid, name in data.items()]
+    if not isinstance(data, list):
+        raise ValueError("expected a JSON list or object")
+    for i, item in enumerate(data, 1):
+        if isinstance(item, dict):
+            yield i, (item.get("id") or None, item.get("name", ""))
+        else:
+            yield i, (None, item)
+
+
+def read_rows(f, fmt=None):
+    """Yield (line, (sid or None, raw name)) from a text file object.
+
+    fmt is "csv", "json" or "jsonl"; when omitted it is sniffed from the first
+    non-blank character ("[" or "{" means JSON, one object per line means JSONL).
+    A lone one-line object without "id"/"name" keys is an id -> name mapping,
+    so it is read as JSON.
+    """
+    lines = iter(f)
+    if fmt is None:
+        head = []
+        for line in lines:
+            head.append(line)
+            if line.strip():
+                break
+        start = head[-1].lstrip() if head else ""
+        if start.startswith("{") and start.rstrip().endswith("}"):
+            try:
+                obj = json.loads(start)
+                fmt = "jsonl"
+            except ValueError:
+                fmt = "json"
+            if fmt == "jsonl" and isinstance(obj, dict) and not {"id", "name"} & set(obj):
+                for line in lines:
+                    head.append(line)
+                    if line.strip():
+                        break
+                else:
+                    fmt = "json"  # nothing after it: the whole file is one mapping
+        elif start.startswith(("[", "{")):
+            fmt = "json"
+        else:
+            fmt = "csv"
+        lines = itertools.chain(head, lines)
+
+    if fmt == "json":
+        return _json_rows(json.loads("".join(lines)))
+    if fmt == "jsonl":
+        return _jsonl_rows(lines)
+    return _csv_rows(lines)
+
+
+def _jsonl_rows(lines):
+    for i, line in enumerate(lines, 1):
+        if line.strip():
+            item = json.loads(line)
+            if isinstance(item, dict):
+                yield i, (item.get("id") or None, item.get("name", ""))
+            else:
+                yield i, (None, item)
+
+
+def plan_import(rows, existing, need_ids=False):
+    """Check rows against the existing roster ({sid: name}, or a list of names).
+
+    With need_ids (the web roster is keyed by ID), rows without an ID get the
+    next free numeric ID; otherwise they are added by name only.
+    """
+    if isinstance(existing, dict):
+        by_id = dict(existing)
+        by_name = {name.lower(): sid for sid, name in by_id.items()}
+    else:
+        by_id = {}
+        by_name = {name.lower(): None for name in existing}
+    numeric = [int(sid) for sid in by_id if sid.isdigit()]
+    next_number = max(numeric) + 1 if numeric else 101
+
+    report = ImportReport()
+    first_line = {}  # lowercased name -> line it was first added from
+    for line, (sid, name) in rows:
+        name = clean_name(name)
+        sid = str(sid).strip() if sid is not None else None
+        if not name:
+            report.errors.append((line, "missing name"))
+            continue
+        if len(name) > MAX_NAME:
+            report.errors.append((line, f"name longer than {MAX_NAME} characters"))
+            continue
+        if sid is not None and not ID_RE.match(sid):
+            report.errors.append((line, f"invalid ID {sid!r}"))
+            continue
+
+        key = name.lower()
+        if key in first_line:
+            report.conflicts.append((line, f"{name} is listed twice (first on line {first_line[key]})"))
+            continue
+        if key in by_name:
+            known = by_name[key]
+            if sid is None or known is None or known == sid:
+                report.unchanged += 1
+            else:
+                report.conflicts.append((line, f"{name} is already on the roster with ID {known}"))
+            continue
+        if sid is not None and sid in by_id:
+            report.conflicts.append((line, f"ID {sid} already belongs to {by_id[sid]}"))
+            continue
+
+        given = sid
+        if sid is None and need_ids:
+            while str(next_number) in by_id:
+                next_number += 1
+            sid = str(next_number)
+        if sid is not None:
+            by_id[sid] = name
+            if sid.isdigit():
+                next_number = max(next_number, int(sid) + 1)
+        by_name[key] = sid
+        first_line[key] = line
+        report.added.append((sid, name))
+        report.accepted.append((line, (given, name)))
+    return report
+
+
+def recheck(report, existing, need_ids=False):
+    """Plan a report's added rows again against a roster that may have changed since."""
+    again = plan_import(report.accepted, existing, need_ids)
+    report.added, report.accepted = again.added, again.accepted
+    report.unchanged += again.unchanged
+    report.conflicts += again.conflicts
+    report.errors += again.errors
+    return report
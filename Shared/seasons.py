@@ -0,0 +1,297 @@
+"""Season rollover: archive closed seasons out of attendance.csv.
+
+    python seasons.py rollover "../Web Server/attendance.csv" --season-start 09-01
+    python seasons.py list|show|export ...
+
+Archives are ``seasons/<season>.csv.gz``; late rows are added as extra gzip
+members. A rollover writes .pending files first and records the log size in
+``seasons/rollover.json``; finish_pending() (run by both apps on startup)
+uses that size to promote or discard them after a crash.
+"""
+import argparse
+import csv
+import datetime
+import gzip
+import io
+import json
+import os
+import sys
+
+from attendance_log import UNIFIED_HEADER, open_log, read_records
+from file_lock import FileLock
+from journal import Journal, write_atomic
+from meetings import calendar_path, load_calendar, meeting_days
+
+SEASONS_FOLDER = "seasons"
+DEFAULT_START = "01-01"  # MM-DD a season begins on; "09-01" gives school-year seasons like 2024-25
+MARKER = "rollover.json"
+SUMMARY_VERSION = 2  # bump when summarize() changes, so cached summaries are rebuilt
+
+_summaries = {}  # archive path -> summary
+
+
+def season_of(date_iso, start=DEFAULT_START):
+    """Season label for an ISO date ("2025", or "2024-25" when seasons don't start on 01-01)."""
+    try:
+        day = datetime.date.fromisoformat(date_iso)
+    except (TypeError, ValueError):
+        return None
+    year = day.year if date_iso[5:] >= start else day.year - 1
+    return str(year) if start == DEFAULT_START else "%d-%02d" % (year, (year + 1) % 100)
+
+
+def season_bounds(label, start=DEFAULT_START):
+    """(first day, last day) of a season label as ISO dates."""
+    year = int(label[:4])
+    month, day = (int(part) for part in start.split("-"))
+    first = datetime.date(year, month, day)
+    last = datetime.date(year + 1, month, day) - datetime.timedelta(days=1)
+    return first.isoformat(), last.isoformat()
+
+
+def archive_folder(log_path):
+    return os.path.join(os.path.dirname(os.path.abspath(log_path)), SEASONS_FOLDER)
+
+
+def archive_path(log_path, label):
+    return os.path.join(archive_folder(log_path), label + ".csv.gz")
+
+
+def list_seasons(log_path):
+    """Archived season labels, oldest first."""
+    try:
+        names = os.listdir(archive_folder(log_path))
+    except FileNotFoundError:
+        return []
+    return sorted(name[:-len(".csv.gz")] for name in names if name.endswith(".csv.gz"))
+
+
+# ---------- Reading Archives ----------
+def season_records(log_path, label):
+    """Yield the Records of an archived season, decompressing as it goes."""
+    with gzip.open(archive_path(log_path, label), "rt", encoding="utf-8", newline="") as f:
+        yield from read_records(f)
+
+
+def all_records(log_path):
+    """Every Record ever logged: the archives oldest first, then the current season."""
+    for label in list_seasons(log_path):
+        yield from season_records(log_path, label)
+    if os.path.exists(log_path):
+        with open_log(log_path) as f:
+            yield from read_records(f)
+
+
+def export_season(log_path, label, out):
+    """Write an archived season to a text file object as CSV."""
+    writer = csv.writer(out)
+    writer.writerow(UNIFIED_HEADER)
+    for rec in season_records(log_path, label):
+        writer.writerow(rec)
+
+
+def missed(days, attended, joined):
+    """Meeting days in days a student missed, from joined (their first row of the season) on.
+
+    Earlier days aren't absences, they hadn't joined yet; with no row at all
+    (joined is None) nothing is missed. Reports and the web API use this too.
+    """
+    if joined is None:
+        return []
+    return sorted(day for day in days if day >= joined and day not in attended)
+
+
+def summarize(records, calendar=None):
+    days, students, attended, joined = set(), {}, {}, {}
+    first = last = ""
+    rows = 0
+    for rec in records:
+        if not rec.date:
+            continue
+        rows += 1
+        key = rec.sid or rec.name
+        joined[key] = min(joined.get(key, rec.date), rec.date)
+        entry = students.setdefault(key, {"name": rec.name, "present": 0, "absent": 0})
+        entry["name"] = rec.name or entry["name"]
+        days.add(rec.date)  # a day with any row was a meeting, calendar or not
+        if rec.status == "Present":
+            attended.setdefault(key, set()).add(rec.date)
+        first = min(first or rec.date, rec.date)
+        last = max(last, rec.date)
+    scheduled = meeting_days(calendar, first, last) if calendar and first else []
+    days.update(scheduled)
+    for key, entry in students.items():
+        here = attended.get(key, set())
+        entry["present"] = len(here)
+        entry["absent"] = len(missed(days, here, joined[key]))
+    return {"first": first, "last": last, "rows": rows, "meeting_days": len(days), "calendar": scheduled,
+            "students": students}
+
+
+def season_summary(log_path, label):
+    """Summary of an archived season, from the cache unless the archive or calendar has changed since."""
+    path = archive_path(log_path, label)
+    size = os.path.getsize(path)  # archives only ever grow, so the size identifies a version
+    calendar = load_calendar(calendar_path(log_path))
+
+    def current(summary):
+        return (summary.get("version") == SUMMARY_VERSION and summary.get("archive_size") == size and
+                summary.get("calendar") == meeting_days(calendar, summary["first"], summary["last"]))
+
+    cached = _summaries.get(path)
+    if cached and current(cached):
+        return cached
+    summary_path = path[:-len(".csv.gz")] + ".summary.json"
+    try:
+        with open(summary_path, "r", encoding="utf-8") as f:
+            summary = json.load(f)
+        if not current(summary):
+            raise ValueError("stale summary")
+    except (FileNotFoundError, ValueError, KeyError):
+        summary = dict(summarize(season_records(log_path, label), calendar), season=label, archive_size=size,
+                       version=SUMMARY_VERSION)
+        write_atomic(summary_path, json.dumps(summary, ensure_ascii=False, indent=1).encode("utf-8"))
+    _summaries[path] = summary
+    return summary
+
+
+# ---------- Rollover ----------
+def _pending_writer(path, header):
+    raw = open(path, "wb")
+    text = io.TextIOWrapper(gzip.GzipFile(fileobj=raw, mode="wb"), encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    if header:
+        writer.writerow(UNIFIED_HEADER)
+    return raw, text, writer
+
+
+def rollover(journal, start=DEFAULT_START, today=None):
+    """Archive every season before today's; returns {season: rows archived}."""
+    log_path = journal.log_path
+    current = season_of((today or datetime.date.today()).isoformat(), start)
+    with journal.lock():
+        if not finish_pending(log_path):
+            raise RuntimeError(f"An earlier rollover did not finish cleanly; check {archive_folder(log_path)}")
+        os.makedirs(archive_folder(log_path), exist_ok=True)
+        before = os.path.getsize(log_path)
+        writers, counts, removed_bytes = {}, {}, 0
+        try:
+            for _, length, rec in journal.rows():
+                label = season_of(rec.date, start)
+                if label is None or label >= current:
+                    continue
+                if label not in writers:
+                    archive = archive_path(log_path, label)
+                    writers[label] = _pending_writer(archive + ".pending", not os.path.exists(archive))
+                writers[label][2].writerow(rec)
+                counts[label] = counts.get(label, 0) + 1
+                removed_bytes += length
+        finally:
+            for raw, text, _ in writers.values():
+                text.close()  # finishes the gzip member; raw stays open for the fsync
+                raw.flush()
+                os.fsync(raw.fileno())
+                raw.close()
+        if not counts:
+            return {}
+
+        archived = {label: (os.path.getsize(archive_path(log_path, label))
+                            if os.path.exists(archive_path(log_path, label)) else 0) for label in counts}
+        marker = {"before": before, "after": before - removed_bytes, "seasons": archived}
+        write_atomic(os.path.join(archive_folder(log_path), MARKER), json.dumps(marker).encode("utf-8"))
+        journal.remove(lambda rec: season_of(rec.date, start) in counts)
+        finish_pending(log_path)
+    return counts
+
+
+def finish_pending(log_path):
+    """Complete or undo a rollover interrupted by a crash; False if the files don't add up."""
+    marker_path = os.path.join(archive_folder(log_path), MARKER)
+    try:
+        with open(marker_path, "r", encoding="utf-8") as f:
+            marker = json.load(f)
+    except FileNotFoundError:
+        return True
+    size = os.path.getsize(log_path) if os.path.exists(log_path) else 0
+    if size == marker["after"]:
+        # The log was rewritten: the pending rows now live only in the .pending files
+        for label, archive_size in marker["seasons"].items():
+            archive = archive_path(log_path, label)
+            pending = archive + ".pending"
+            if not os.path.exists(pending):
+                continue
+            current = os.path.getsize(archive) if os.path.exists(archive) else 0
+            if current == archive_size:
+                with open(pending, "rb") as f:
+                    added = f.read()
+                old = b""
+                if current:
+                    with open(archive, "rb") as f:
+                        old = f.read()
+                write_atomic(archive, old + added)  # a second gzip member; readers see one stream
+            os.remove(pending)
+            season_summary(log_path, label)
+    elif size == marker["before"]:
+        # The log was never rewritten: the rows are all still in it
+        for label in marker["seasons"]:
+            pending = archive_path(log_path, label) + ".pending"
+            if os.path.exists(pending):
+                os.remove(pending)
+    else:
+        return False
+    os.remove(marker_path)
+    return True
+
+
+# ---------- Command Line ----------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive closed seasons of an attendance log and read them back.")
+    sub = parser.add_subparsers(dest="command")
+    sub.required = True
+    p = sub.add_parser("rollover", help="move seasons before the current one into seasons/")
+    p.add_argument("log")
+    p.add_argument("--season-start", default=DEFAULT_START, help="MM-DD seasons begin on (default 01-01)")
+    p.add_argument("--roster", help="the app's students.json (default: next to the log)")
+    p = sub.add_parser("list", help="list archived seasons with their summaries")
+    p.add_argument("log")
+    p = sub.add_parser("show", help="per-student totals for one archived season")
+    p.add_argument("log")
+    p.add_argument("season")
+    p = sub.add_parser("export", help="write one archived season as CSV")
+    p.add_argument("log")
+    p.add_argument("season")
+    p.add_argument("-o", "--output", help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.command == "rollover":
+        folder = os.path.dirname(os.path.abspath(args.log))
+        roster = args.roster or os.path.join(folder, "students.json")
+        # Same lock file as the apps, so this waits for (and blocks) their writes
+        lock = FileLock(os.path.join(folder, "attendance.lock"))
+        journal = Journal(args.log, roster, lock=lambda: lock).recover()
+        counts = rollover(journal, args.season_start)
+        journal.close()
+        if not counts:
+            print("Nothing to archive: the log only holds the current season.")
+        for label, n in sorted(counts.items()):
+            print(f"Archived {n} rows to {archive_path(args.log, label)}")
+    elif args.command == "list":
+        for label in list_seasons(args.log):
+            s = season_summary(args.log, label)
+            print(f"{label}: {s['first']} to {s['last']}, {s['meeting_days']} meeting days, "
+                  f"{len(s['students'])} students, {s['rows']} rows")
+    elif args.command == "show":
+        s = season_summary(args.log, args.season)
+        print(f"{args.season}: {s['meeting_days']} meeting days")
+        for entry in sorted(s["students"].values(), key=lambda e: (-e["present"], e["name"].lower())):
+            print(f"  {entry['name']:<30} {entry['present']:>4} present {entry['absent']:>4} absent")
+    elif args.command == "export":
+        if args.output:
+            with open(args.output, "w", newline="", encoding="utf-8") as out:
+                export_season(args.log, args.season, out)
+        else:
+            export_season(args.log, args.season, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
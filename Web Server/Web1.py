@@ -1,26 +1,57 @@
-from flask import Flask, request, redirect, url_for, render_template_string, flash, send_file, jsonify
+from flask import Flask, request, redirect, url_for, render_template_string, flash, send_file, jsonify, g, abort, has_app_context, Response
+import base64
 import csv
 import datetime
 import os
 import json
+import io
+import re
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from contextlib import contextmanager
 from io import StringIO
 
+# Storage code shared with the Tk kiosk lives in ../Shared
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Shared"))
+import meetings
+import roster_import
+import seasons
+from attendance_log import UNIFIED_HEADER, LogTail, records_between
+from bitmaps import AttendanceBitmaps
+from journal import Journal
+from file_lock import FileLock
+from asset_pipeline import AssetPipeline
+
 app = Flask(__name__)
 app.secret_key = os.environ.get("SECRET_KEY", "dev-secret")  # for flashes
+assets = AssetPipeline(app)  # hashed/cached CSS and logo variants, gzip for pages and JSON
 
 FILENAME = "attendance.csv"
 STUDENTS_FILE = "students.json"
+SYNC_LOG = "sync_events.log"  # ids of kiosk events already applied, so retried batches are ignored
+SYNC_IDS_KEPT = 20000  # newest applied ids remembered; an older retry is still caught by the duplicate-row check
+LOCK_FILE = "attendance.lock"  # serializes writers across threads and worker processes
+TEAM_CONFIG = "config.json"  # optional per-team settings, e.g. {"admin_pin": "...", "season_start": "09-01"}
+TEAMS_FOLDER = "teams"  # hosted teams live in teams/<team>/, served under /t/<team>/
+TEAM_CACHE_BYTES = int(os.environ.get("TEAM_CACHE_BYTES", 64 * 1024 * 1024))  # cap on parsed per-team state
+TEAM_RE = re.compile(r"^[A-Za-z0-9_-]{1,32}$")
+API_PAGE_SIZE = 100  # default rows per /api/attendance page
+API_PAGE_MAX = 1000
 ADMIN_PIN = os.environ.get("ADMIN_PIN", "1234")  # demo PIN; set env var in production
 
 
 # ---------- Storage Helpers ----------
-def init_files():
-    if not os.path.exists(FILENAME):
-        with open(FILENAME, "w", newline="", encoding="utf-8") as f:
+def init_files(folder="."):
+    attendance_file = os.path.join(folder, FILENAME)
+    students_file = os.path.join(folder, STUDENTS_FILE)
+    if not os.path.exists(attendance_file):
+        with open(attendance_file, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
             writer.writerow(["Date", "Student ID", "Name", "Status"])
-    if not os.path.exists(STUDENTS_FILE):
-        with open(STUDENTS_FILE, "w", encoding="utf-8") as f:
+    if not os.path.exists(students_file):
+        with open(students_file, "w", encoding="utf-8") as f:
             json.dump({
                 "101": "Alice",
                 "102": "Bob",
@@ -29,36 +60,420 @@ def init_files():
                 "105": "Ethan"
             }, f, indent=2)
 
+def team_folder(team):
+    # The default team ("") keeps using the files next to Web1.py
+    return os.path.join(TEAMS_FOLDER, team) if team else "."
+
+def create_team(team):
+    if not TEAM_RE.match(team):
+        raise ValueError(f"Invalid team name: {team!r}")
+    os.makedirs(team_folder(team), exist_ok=True)
+    init_files(team_folder(team))
+
+
+class AttendanceLog:
+    """Incrementally parsed view of the attendance CSV.
+
+    The file is only ever appended to, so after the first full read each
+    refresh parses just the bytes written since (by this or any other worker).
+    A replaced or truncated file is detected and re-read from the start.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.tail = LogTail(path)
+        self._lock = threading.Lock()
+        self._reset()
+
+    @property
+    def ident(self):
+        return self.tail.ident
+
+    def _reset(self):
+        self.tail.restart()
+        self.rows = []        # Records (date, student id, name, status) in file order
+        self.dates = []       # latest date seen up to each row (never decreases), for bisecting
+        self.by_date = {}     # date -> indexes into rows
+        self.by_student = {}  # student id -> indexes into rows (ascending)
+        self.in_order = True  # False if some row is dated before the one above it
+
+    def refresh(self):
+        with self._lock:
+            rows = self.tail.read()
+            if rows is None:
+                self._reset()
+                rows = self.tail.read()
+            for _, _, rec in rows:
+                self._add(rec)
+        return self
+
+    def _add(self, rec):
+        if not rec[0]:
+            return
+        i = len(self.rows)
+        latest = rec[0]
+        if self.dates and rec[0] < self.dates[-1]:
+            self.in_order = False
+            latest = self.dates[-1]
+        self.by_date.setdefault(rec[0], []).append(i)
+        self.by_student.setdefault(rec[1], []).append(i)
+        self.dates.append(latest)
+        self.rows.append(rec)
+
+    def on(self, date_iso):
+        return [self.rows[i] for i in self.by_date.get(date_iso, ())]
+
+    def query(self, start=None, end=None, sid=None, status=None, after=0, limit=API_PAGE_SIZE):
+        """Rows matching the filters, from row index `after` on.
+
+        Returns (rows, index to resume from, or None when there are no more).
+        Date bounds are inclusive ISO strings; the date range is found by
+        bisecting and a student's rows come from by_student, so only matching
+        rows are visited. Late (out-of-order) rows only cost the end bound.
+        """
+        with self._lock:
+            lo, hi = after, len(self.rows)
+            if start:
+                lo = max(lo, bisect_left(self.dates, start))
+            if end and self.in_order:
+                hi = bisect_right(self.dates, end)
+            if sid is not None:
+                ids = self.by_student.get(sid, [])
+                candidates = (ids[j] for j in range(bisect_left(ids, lo), bisect_left(ids, hi)))
+            else:
+                candidates = range(lo, hi)
+
+            page = []
+            for i in candidates:
+                rec = self.rows[i]
+                if not self.in_order and ((start and rec[0] < start) or (end and rec[0] > end)):
+                    continue
+                if status and rec[3] != status:
+                    continue
+                if len(page) == limit:
+                    return page, i
+                page.append(rec)
+            return page, None
+
+
+class TeamStore:
+    """One team's partition: its data files plus the parsed state cached for them."""
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.attendance_file = os.path.join(folder, FILENAME)
+        self.students_file = os.path.join(folder, STUDENTS_FILE)
+        self.sync_log = os.path.join(folder, SYNC_LOG)
+        self.lock_file = os.path.join(folder, LOCK_FILE)
+        self.calendar_file = os.path.join(folder, meetings.MEETINGS_FILE)  # meeting days; absences derive from it
+        self.attendance = AttendanceLog(self.attendance_file)  # full history, built on first /api/attendance
+        self.journal = Journal(self.attendance_file, self.students_file, lock=lambda: locked(self))
+        self.roster_stamp = None
+        self.roster = {}
+        self.applied = OrderedDict()  # kiosk event ids already applied, oldest first
+        self.applied_ident = None     # (dev, inode) of the sync_log being tailed
+        self.applied_offset = 0       # how far into sync_log they've been read
+        self.file_lock = FileLock(self.lock_file)
+        try:
+            with open(os.path.join(folder, TEAM_CONFIG), "r", encoding="utf-8") as f:
+                config = json.load(f)
+        except (FileNotFoundError, ValueError):
+            config = {}
+        self.admin_pin = str(config.get("admin_pin") or ADMIN_PIN)
+        self.season_start = config.get("season_start", seasons.DEFAULT_START)
+        # Every season, built on first set query
+        self.bitmaps = AttendanceBitmaps(self.attendance_file, season_start=self.season_start)
+
+    def weight(self):
+        # Rough bytes of parsed state held for this team
+        return (1024 + 200 * len(self.attendance.rows) + 150 * len(self.roster) + 80 * len(self.applied)
+                + 80 * len(self.journal.counts)
+                + 100 * len(self.bitmaps.students) + 60 * len(self.bitmaps.days)
+                + len(self.bitmaps.days) * len(self.bitmaps.students) // 4)
+
+
+class TeamCache:
+    """LRU of TeamStores, evicted by approximate size rather than count.
+
+    The team being requested is never evicted, so one oversized team still
+    works; everyone else is dropped least-recently-used first once the total
+    goes over max_bytes, and is re-read from disk on its next request.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._stores = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, team):
+        with self._lock:
+            store = self._stores.get(team)
+            if store is None:
+                store = self._stores[team] = TeamStore(team_folder(team))
+            else:
+                self._stores.move_to_end(team)
+            total = sum(s.weight() for s in self._stores.values())
+            while total > self.max_bytes and len(self._stores) > 1:
+                _, evicted = self._stores.popitem(last=False)
+                total -= evicted.weight()
+            return store
+
+    def stores(self):
+        with self._lock:
+            return list(self._stores.values())
+
+teams = TeamCache(TEAM_CACHE_BYTES)
+
+def store():
+    # The team picked from the URL for this request, else the default team
+    if has_app_context() and "store" in g:
+        return g.store
+    return teams.get("")
+
+
+# ---------- File Locking ----------
+# Every read-modify-write of the data files runs under locked(), so a check-in
+# on one worker can't race a duplicate check-in or a roster save on another
+# (or a season rollover run from the command line; see Shared/file_lock.py).
+@contextmanager
+def locked(st=None):
+    with (st or store()).file_lock:
+        yield
+
+
+# ---------- Caches ----------
 def load_students():
-    with open(STUDENTS_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    # Re-parse only when the file changed (possibly from another worker)
+    st = store()
+    info = os.stat(st.students_file)
+    stamp = (info.st_mtime_ns, info.st_size)
+    if st.roster_stamp != stamp:
+        with open(st.students_file, "r", encoding="utf-8") as f:
+            st.roster = json.load(f)
+        st.roster_stamp = stamp
+    return dict(st.roster)
 
 def save_students(students):
-    with open(STUDENTS_FILE, "w", encoding="utf-8") as f:
-        json.dump(students, f, indent=2, ensure_ascii=False)
+    # Journaled, then write-then-rename so readers never see a half-written roster
+    store().journal.save_roster(students)
+
+def attendance_log():
+    return store().attendance.refresh()
+
+def load_meetings():
+    return meetings.load_calendar(store().calendar_file)
+
+def attendance_bitmaps():
+    return store().bitmaps.refresh()
+
+def rows_on(date_iso):
+    # Seeks to the date through the .idx sidecar instead of loading the whole history
+    return records_between(store().attendance_file, date_iso, date_iso)
+
+def warm_caches(team_names=()):
+    """Recover and load each team's roster and attendance state before serving traffic."""
+    init_files()
+    for team in ("",) + tuple(team_names):
+        if team:
+            create_team(team)
+        with app.app_context():
+            g.store = teams.get(team)
+            g.store.journal.recover()
+            with locked():
+                seasons.finish_pending(g.store.attendance_file)  # a rollover cut off by a crash
+            load_students()
+            applied_events()
+
+def shutdown_storage():
+    # Wait out any in-flight write, then make sure everything reached the disk
+    for st in teams.stores():
+        with locked(st):
+            for path in (st.attendance_file, st.students_file, st.sync_log):
+                if os.path.exists(path):
+                    with open(path, "ab") as f:
+                        os.fsync(f.fileno())
+            st.journal.close()
+
 
 def already_checked_in(student_id, date_iso):
-    try:
-        with open(FILENAME, "r", encoding="utf-8") as f:
-            r = csv.DictReader(f)
-            for row in r:
-                if row["Date"] == date_iso and row["Student ID"] == student_id and row["Status"] == "Present":
-                    return True
-    except FileNotFoundError:
-        return False
-    return False
+    return student_id in todays_present(date_iso)
+
+def todays_present(date_iso):
+    present = store().journal.present_on(date_iso)
+    if present is None:  # an older date than the journal keeps in memory
+        present = {sid for _, sid, _, status in rows_on(date_iso) if status == "Present"}
+    return present
 
 def mark_attendance(student_id, name, status="Present"):
     today = datetime.date.today().isoformat()
-    # Prevent duplicates for Present
-    if status == "Present" and already_checked_in(student_id, today):
-        return False, f"{name} is already marked Present today."
-    with open(FILENAME, "a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow([today, student_id, name, status])
+    with locked():
+        # Prevent duplicates for Present
+        if status == "Present" and already_checked_in(student_id, today):
+            return False, f"{name} is already marked Present today."
+        store().journal.append([[today, student_id, name, status]])
     return True, f"Welcome, {name}! You're marked {status}."
 
 
+def attendance_sets(args):
+    """Roster students Present on all of args["all"], any of args["any"] and none of args["none"].
+
+    Each is a comma-separated list of dates and/or start..end ranges (which
+    cover the meeting days in between). Returns (result, error); a date that
+    wasn't a meeting day or a range without one is an error.
+    """
+    bitmaps = attendance_bitmaps()
+    days = {}
+    for which in ("all", "any", "none"):
+        spec = (args.get(which) or "").strip()
+        try:
+            days[which] = bitmaps.days_in(spec) if spec else []
+        except ValueError as e:
+            return None, f"{which}: {e}."
+    if not any(days.values()):
+        return None, "Give at least one of all, any or none."
+    students = load_students()
+    bits = bitmaps.select(days["all"], days["any"], days["none"], among=bitmaps.mask(students))
+    # Meetings attended over the span the question covers, for context
+    named = days["all"] + days["any"] + days["none"]
+    start, end = min(named), max(named)
+    out = []
+    for sid in sorted(bitmaps.keys(bits), key=lambda k: students[k].lower()):
+        attended, meetings = bitmaps.attended(sid, start, end)
+        out.append({"id": sid, "name": students[sid], "attended": attended, "meetings": meetings})
+    return {"days": days, "from": start, "to": end, "count": len(out), "students": out}, None
+
+
+def next_student_id(students):
+    # Kiosks only know names; give new students the next free numeric ID
+    numeric = [int(sid) for sid in students if sid.isdigit()]
+    return str(max(numeric) + 1 if numeric else 101)
+
+
+def import_students(f, fmt=None, dry_run=False):
+    """Bulk-add students from a CSV/JSON text stream in one roster write."""
+    # Check the upload against a roster snapshot first, so a slow upload never holds the lock
+    report = roster_import.plan_import(roster_import.read_rows(f, fmt), load_students(), need_ids=True)
+    if not report.added or dry_run:
+        return report
+    with locked():
+        students = load_students()
+        roster_import.recheck(report, students, need_ids=True)  # the roster may have changed meanwhile
+        if report.added:
+            students.update(report.added)
+            save_students(students)
+    return report
+
+
+# ---------- Kiosk Sync ----------
+def applied_events():
+    # Tail the log so ids applied by other workers are seen too
+    st = store()
+    try:
+        with open(st.sync_log, "rb") as f:
+            info = os.fstat(f.fileno())
+            if (info.st_dev, info.st_ino) != st.applied_ident:
+                st.applied_ident, st.applied_offset = (info.st_dev, info.st_ino), 0  # compacted: read it again
+            f.seek(st.applied_offset)
+            chunk = f.read()
+    except FileNotFoundError:
+        return st.applied
+    end = chunk.rfind(b"\n") + 1
+    st.applied_offset += end
+    remember_events(st.applied, (line for line in chunk[:end].decode("utf-8").split() if line))
+    return st.applied
+
+def remember_events(seen, ids):
+    for eid in ids:
+        seen[eid] = None
+        seen.move_to_end(eid)
+    while len(seen) > SYNC_IDS_KEPT:
+        seen.popitem(last=False)
+
+def compact_sync_log(path, seen):
+    # Keep the file to the ids still remembered, once it has grown well past them
+    if os.path.getsize(path) < 80 * SYNC_IDS_KEPT:
+        return
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("".join(eid + "\n" for eid in seen))
+    os.replace(tmp, path)
+
+def present_keys(date_iso):
+    # Students by ID, guests (no ID) by lowercased name
+    return {sid or "guest:" + name.lower()
+            for _, sid, name, status in rows_on(date_iso) if status == "Present"}
+
+def apply_sync_events(events):
+    """Apply a batch of kiosk events in order; returns (acked ids, applied, skipped)."""
+    with locked():
+        return _apply_sync_events(events)
+
+def _apply_sync_events(events):
+    students = load_students()
+    by_name = {name.lower(): sid for sid, name in students.items()}
+    seen = applied_events()
+    present = {}  # date -> present_keys(date), loaded once per batch
+    acked, rows, new_ids = [], [], []
+    applied = skipped = 0
+    roster_changed = False
+
+    for ev in events:
+        eid = str(ev.get("id") or "").strip()
+        if not eid:
+            continue
+        acked.append(eid)
+        if eid in seen or eid in new_ids:
+            skipped += 1
+            continue
+        new_ids.append(eid)
+        kind = ev.get("type", "checkin")
+        name = str(ev.get("name") or "").strip()
+        sid = str(ev.get("sid") or "").strip() or by_name.get(name.lower(), "")
+
+        if kind == "checkin":
+            date_iso = str(ev.get("date") or "")
+            status = str(ev.get("status") or "Present")
+            try:
+                datetime.date.fromisoformat(date_iso)
+            except ValueError:
+                skipped += 1
+                continue
+            if status == "Present":
+                if date_iso not in present:
+                    present[date_iso] = present_keys(date_iso)
+                key = sid or "guest:" + name.lower()
+                if key in present[date_iso]:
+                    skipped += 1
+                    continue
+                present[date_iso].add(key)
+            rows.append([date_iso, sid, students.get(sid, name), status])
+        elif kind == "student_add" and name and name.lower() not in by_name:
+            sid = next_student_id(students)
+            students[sid] = name
+            by_name[name.lower()] = sid
+            roster_changed = True
+        elif kind == "student_delete" and sid in students:
+            by_name.pop(students.pop(sid).lower(), None)
+            roster_changed = True
+        else:
+            skipped += 1
+            continue
+        applied += 1
+
+    if rows:
+        # Kiosk batches can span days; keep them in date order for the index
+        store().journal.append(sorted(rows, key=lambda r: r[0]))
+    if roster_changed:
+        save_students(students)
+    # Record ids only after the data is on disk; a crash in between just means a retry
+    if new_ids:
+        with open(store().sync_log, "a", encoding="utf-8") as f:
+            f.write("\n".join(new_ids) + "\n")
+        remember_events(seen, new_ids)
+        compact_sync_log(store().sync_log, seen)
+    return acked, applied, skipped
+
+
 # ---------- Templates ----------
 BASE_CSS = """
 :root {
@@ -136,6 +551,24 @@ body {
   transition: transform .06s ease;
 }
 
+/* Virtualized grid: only the rows in view are in the DOM, positioned by script */
+.vgrid {
+  position: relative;
+  display: block;
+}
+
+.vgrid .card {
+  position: absolute;
+  height: 92px;
+  overflow: hidden;
+}
+
+.vgrid .card-btn {
+  white-space: nowrap;
+  overflow: hidden;
+  text-overflow: ellipsis;
+}
+
 .card-btn:hover { transform: translateY(-2px); }
 .card-btn:active { transform: translateY(0px) scale(.99); }
 
@@ -215,6 +648,7 @@ body {
 
 .kiosk-hint { color: #aaa; font-size: 12px; }
 """
+assets.add_text("app.css", BASE_CSS, "text/css")
 
 INDEX_TMPL = """
 <!doctype html>
@@ -223,11 +657,11 @@ INDEX_TMPL = """
 <meta charset="utf-8" />
 <meta name="viewport" content="width=device-width, initial-scale=1" />
 <title>Attendance Kiosk</title>
-<style>{{ css }}</style>
+<link rel="stylesheet" href="{{ asset_url('app.css') }}" />
 </head>
 <body>
 <div class="header">
-  <img src="{{ url_for('static', filename='logo.png') }}" alt="Logo" class="logo" />
+  <img src="{{ logo_url(50) }}" srcset="{{ logo_url(100) }} 2x" alt="Logo" class="logo" />
   <div class="title">📌 Tap Your Name to Check In</div>
   <a class="btn secondary admin-btn" href="{{ url_for('admin') }}">Admin</a>
 </div>
@@ -241,37 +675,92 @@ INDEX_TMPL = """
       {% endif %}
     {% endwith %}
 
-    <input id="search" class="search" placeholder="Search your name..." oninput="filter()" autofocus />
-
-    <div id="grid" class="grid">
-      {% for sid, name in students.items() %}
-        <form class="card" method="POST" action="{{ url_for('checkin', student_id=sid) }}">
-          <button class="card-btn" type="submit">🙋 {{ name }}</button>
-          <div class="row" style="margin-top:6px;">
-            <span class="subtle">ID: {{ sid }}</span>
-            {% if checked_in_today.get(sid) %}
-              <span class="badge">Present Today</span>
-            {% endif %}
-          </div>
-        </form>
-      {% endfor %}
-    </div>
+    <input id="search" class="search" placeholder="Search your name..." autocomplete="off" autofocus />
+
+    <div id="grid" class="vgrid"></div>
+    <div id="empty" class="subtle" style="display:none; margin-top:18px;">No matching names.</div>
 
     <div class="footer">
       <div class="small kiosk-hint">Tip: Press F11 (Windows) or Ctrl+Cmd+F (Mac) for fullscreen kiosk.</div>
     </div>
   </div>
 
+<script id="roster" type="application/json">{{ roster|tojson }}</script>
 <script>
-function norm(s){ return s.toLowerCase().trim(); }
-function filter(){
-  const q = norm(document.getElementById('search').value);
-  const cards = document.querySelectorAll('.card');
-  cards.forEach(c=>{
-    const text = norm(c.innerText);
-    c.style.display = text.includes(q) ? '' : 'none';
-  });
-}
+(function(){
+  // Fixed card geometry lets us work out which rows are visible without touching the DOM
+  const MIN_W = 220, GAP = 14, CARD_H = 92, OVERSCAN = 2, DEBOUNCE_MS = 120;
+  const grid = document.getElementById('grid');
+  const empty = document.getElementById('empty');
+  const search = document.getElementById('search');
+  const action = "{{ url_for('checkin', student_id='__SID__') }}";
+
+  // Roster rows are [id, name, presentToday]; search keys are normalized once, up front
+  const roster = JSON.parse(document.getElementById('roster').textContent);
+  const keys = roster.map(s => norm(s[1] + ' ' + s[0]));
+  let view = roster.map((_, i) => i);
+  let cols = 1, cardW = MIN_W, drawn = '', timer = 0, frame = 0;
+
+  function norm(s){ return s.toLowerCase().trim(); }
+  function esc(s){ return String(s).replace(/[&<>"']/g, c => '&#' + c.charCodeAt(0) + ';'); }
+
+  function card(s, row, col){
+    const top = row * (CARD_H + GAP), left = col * (cardW + GAP);
+    return '<form class="card" method="POST" action="' + esc(action.replace('__SID__', encodeURIComponent(s[0]))) + '"' +
+      ' style="top:' + top + 'px;left:' + left + 'px;width:' + cardW + 'px">' +
+      '<button class="card-btn" type="submit">🙋 ' + esc(s[1]) + '</button>' +
+      '<div class="row" style="margin-top:6px;"><span class="subtle">ID: ' + esc(s[0]) + '</span>' +
+      (s[2] ? '<span class="badge">Present Today</span>' : '') + '</div></form>';
+  }
+
+  function render(){
+    frame = 0;
+    const rowH = CARD_H + GAP;
+    const top = grid.getBoundingClientRect().top;
+    const rows = Math.ceil(view.length / cols);
+    const first = Math.max(0, Math.floor(-top / rowH) - OVERSCAN);
+    const last = Math.min(rows, Math.ceil((window.innerHeight - top) / rowH) + OVERSCAN);
+    const sig = first + ':' + last + ':' + cols + ':' + view.length + ':' + (view[0] === undefined ? '' : view[0]);
+    if (sig === drawn) return;
+    drawn = sig;
+    const html = [];
+    for (let r = first; r < last; r++) {
+      for (let c = 0; c < cols; c++) {
+        const i = view[r * cols + c];
+        if (i === undefined) break;
+        html.push(card(roster[i], r, c));
+      }
+    }
+    grid.innerHTML = html.join('');
+  }
+
+  function schedule(){ if (!frame) frame = requestAnimationFrame(render); }
+
+  function layout(){
+    const width = grid.clientWidth;
+    cols = Math.max(1, Math.floor((width + GAP) / (MIN_W + GAP)));
+    cardW = Math.floor((width - (cols - 1) * GAP) / cols);
+    const rows = Math.ceil(view.length / cols);
+    grid.style.height = rows ? (rows * (CARD_H + GAP) - GAP) + 'px' : '0';
+    empty.style.display = view.length ? 'none' : '';
+    drawn = '';
+    schedule();
+  }
+
+  function filter(){
+    const q = norm(search.value);
+    view = [];
+    for (let i = 0; i < keys.length; i++) {
+      if (!q || keys[i].indexOf(q) !== -1) view.push(i);
+    }
+    layout();
+  }
+
+  search.addEventListener('input', () => { clearTimeout(timer); timer = setTimeout(filter, DEBOUNCE_MS); });
+  window.addEventListener('scroll', schedule, { passive: true });
+  window.addEventListener('resize', layout);
+  layout();
+})();
 </script>
 </body>
 </html>
@@ -284,12 +773,12 @@ ADMIN_TMPL = """
 <meta charset="utf-8" />
 <meta name="viewport" content="width=device-width, initial-scale=1" />
 <title>Admin • Attendance</title>
-<style>{{ css }}</style>
+<link rel="stylesheet" href="{{ asset_url('app.css') }}" />
 </head>
 
 <body>
   <div class="header">
-  <img src="{{ url_for('static', filename='logo.png') }}" alt="Logo" class="logo" />
+  <img src="{{ logo_url(50) }}" srcset="{{ logo_url(100) }} 2x" alt="Logo" class="logo" />
   <div class="title">⚙️ Admin</div>
   <a class="btn secondary admin-btn" href="{{ url_for('index') }}">Home</a>
 </div>
@@ -320,13 +809,33 @@ ADMIN_TMPL = """
         <button class="btn" type="submit">Add</button>
       </form>
 
+      <h3>Import Students</h3>
+      <form method="POST" action="{{ url_for('import_students_form') }}" enctype="multipart/form-data">
+        <div class="row" style="gap:8px; flex-wrap:wrap;">
+          <input class="search" style="max-width:320px" type="file" name="file" accept=".csv,.json,.jsonl,.txt" />
+          <button class="btn" type="submit">Import</button>
+        </div>
+        <textarea class="search" name="rows" rows="4" style="margin-top:8px;" placeholder="…or paste rows: &quot;Student ID,Name&quot;, one name per line, or JSON"></textarea>
+        <div class="small">Columns like Student ID, Name or First/Last Name are recognized. Students without an ID get the next free one.</div>
+      </form>
+
       <div class="actions">
         <a class="btn secondary" href="{{ url_for('download_csv') }}">Download CSV</a>
-        <form method="POST" action="{{ url_for('mark_all_absent') }}" onsubmit="return confirm('Mark all not-present students as Absent for today?');">
+        <form method="POST" action="{{ url_for('mark_all_absent') }}" onsubmit="return confirm('Count today as a meeting? Students who have not checked in will show as Absent.');">
           <button class="btn" type="submit">Mark Missing as Absent (Today)</button>
         </form>
       </div>
 
+      <h3 style="margin-top:20px;">Meeting Calendar</h3>
+      <form method="POST" action="{{ url_for('save_calendar_form') }}">
+        <textarea class="search" name="weekly" rows="3" placeholder="Weekly schedules, one per line: Tue,Thu 2025-09-02..2026-06-15">{% for e in calendar.weekly %}{{ format_weekly(e) }}
+{% endfor %}</textarea>
+        <input class="search" style="margin-top:8px;" name="dates" placeholder="One-off meetings: 2025-10-04, 2025-10-11" value="{{ calendar.dates|join(', ') }}" />
+        <input class="search" style="margin-top:8px;" name="cancelled" placeholder="Cancelled: 2025-11-27" value="{{ calendar.cancelled|join(', ') }}" />
+        <button class="btn secondary" style="margin-top:8px;" type="submit">Save Calendar</button>
+      </form>
+      <div class="small">Students who don’t check in on a meeting day count as Absent; nothing has to be marked.</div>
+
       <h3 style="margin-top:20px;">Students</h3>
       <table class="table">
         <thead><tr><th>ID</th><th>Name</th><th>Actions</th></tr></thead>
@@ -345,6 +854,51 @@ ADMIN_TMPL = """
         </tbody>
       </table>
 
+      <h3 style="margin-top:20px;">Who Was There?</h3>
+      <form method="GET" action="{{ url_for('admin') }}" class="row" style="gap:8px; flex-wrap:wrap;">
+        <input class="search" style="max-width:220px" name="all" placeholder="Present on all of" value="{{ request.args.get('all', '') }}" />
+        <input class="search" style="max-width:220px" name="any" placeholder="Present on any of" value="{{ request.args.get('any', '') }}" />
+        <input class="search" style="max-width:220px" name="none" placeholder="Absent from all of" value="{{ request.args.get('none', '') }}" />
+        <button class="btn secondary" type="submit">Find</button>
+      </form>
+      <div class="small">Dates like 2025-10-04,2025-10-11 or ranges like 2025-10-06..2025-10-12 (every meeting day in between).</div>
+      {% if sets_error %}
+      <div class="small">{{ sets_error }}</div>
+      {% elif sets %}
+      <table class="table">
+        <thead><tr><th>ID</th><th>Name</th><th>Attended {{ sets.from }} – {{ sets.to }}</th></tr></thead>
+        <tbody>
+        {% for s in sets.students %}
+          <tr><td>{{ s.id }}</td><td>{{ s.name }}</td><td>{{ s.attended }} of {{ s.meetings }}</td></tr>
+        {% endfor %}
+        </tbody>
+      </table>
+      <div class="small">{{ sets.count }} students.</div>
+      {% endif %}
+
+      <h3 style="margin-top:20px;">Past Seasons</h3>
+      {% if past %}
+      <table class="table">
+        <thead><tr><th>Season</th><th>Dates</th><th>Meeting Days</th><th>Students</th><th></th></tr></thead>
+        <tbody>
+        {% for label, s in past %}
+          <tr>
+            <td>{{ label }}</td>
+            <td>{{ s.first }} – {{ s.last }}</td>
+            <td>{{ s.meeting_days }}</td>
+            <td>{{ s.students|length }}</td>
+            <td><a class="btn secondary" href="{{ url_for('export_season', season=label) }}">CSV</a></td>
+          </tr>
+        {% endfor %}
+        </tbody>
+      </table>
+      {% else %}
+      <div class="small">No seasons archived yet.</div>
+      {% endif %}
+      <form method="POST" action="{{ url_for('rollover_season') }}" style="margin-top:8px;" onsubmit="return confirm('Move all past seasons out of attendance.csv into compressed archives?');">
+        <button class="btn secondary" type="submit">Roll Over Season</button>
+      </form>
+
       <h3 style="margin-top:20px;">Today’s Attendance ({{ today }})</h3>
       <table class="table">
         <thead><tr><th>Time</th><th>ID</th><th>Name</th><th>Status</th></tr></thead>
@@ -366,156 +920,425 @@ ADMIN_TMPL = """
 """
 
 
+# ---------- Team Routing ----------
+# Every page and API is served twice: at its plain URL for the default team and
+# under /t/<team>/ for hosted teams. url_for() adds the current team automatically.
+def team_route(rule, **options):
+    def decorator(f):
+        app.add_url_rule(rule, view_func=f, **options)
+        app.add_url_rule("/t/<team>" + rule, view_func=f, **options)
+        return f
+    return decorator
+
+@app.url_value_preprocessor
+def pick_team(endpoint, values):
+    team = (values or {}).pop("team", "")
+    if team and (not TEAM_RE.match(team) or not os.path.isdir(team_folder(team))):
+        abort(404)
+    g.team = team
+    g.store = teams.get(team)
+
+@app.url_defaults
+def add_team(endpoint, values):
+    if g.get("team") and "team" not in values and app.url_map.is_endpoint_expecting(endpoint, "team"):
+        values["team"] = g.team
+
+def auth_cookie():
+    # Separate cookie per team so unlocking one team's admin doesn't unlock the rest
+    return "authed_" + g.team if g.get("team") else "authed"
+
+def is_authed():
+    return request.cookies.get(auth_cookie()) == "1"
+
+
 # ---------- Routes ----------
-@app.route("/")
+@team_route("/")
 def index():
     students = load_students()
     today = datetime.date.today().isoformat()
-    checked = {sid: already_checked_in(sid, today) for sid in students.keys()}
-    return render_template_string(INDEX_TMPL, css=BASE_CSS, students=students, checked_in_today=checked)
+    present = todays_present(today)
+    # Compact roster for the client-side grid: [id, name, presentToday]
+    roster = [[sid, name, 1 if sid in present else 0] for sid, name in students.items()]
+    return render_template_string(INDEX_TMPL, roster=roster)
 
-@app.post("/checkin/<student_id>")
+@team_route("/checkin/<student_id>", methods=["POST"])
 def checkin(student_id):
     students = load_students()
     if student_id not in students:
-        flash("Student not found.", "error")
-        return redirect(url_for("index"))
-    ok, msg = mark_attendance(student_id, students[student_id], "Present")
+        ok, msg = False, "Student not found."
+    else:
+        ok, msg = mark_attendance(student_id, students[student_id], "Present")
+    if request.accept_mimetypes.best == "application/json":
+        # Scripted clients (loadtest.py) get the outcome instead of a flash and a redirect
+        return jsonify({"ok": ok, "message": msg})
     flash(msg, "ok" if ok else "error")
     return redirect(url_for("index"))
 
-@app.route("/admin", methods=["GET", "POST"])
+@team_route("/admin", methods=["GET", "POST"])
 def admin():
     authed = False
     if request.method == "POST":
         pin = request.form.get("pin", "")
-        if pin == ADMIN_PIN:
+        if pin == store().admin_pin:
             authed = True
             # remember via session cookie
             request.environ["authed"] = True
             resp = redirect(url_for("admin"))
-            resp.set_cookie("authed", "1", samesite="Lax")
+            resp.set_cookie(auth_cookie(), "1", samesite="Lax")
             return resp
         else:
             flash("Wrong PIN.", "error")
 
     # cookie-based simple auth (demo)
-    if request.cookies.get("authed") == "1":
+    if is_authed():
         authed = True
 
     students = load_students()
     today_iso = datetime.date.today().isoformat()
-    todays = []
-    try:
-        with open(FILENAME, "r", encoding="utf-8") as f:
-            r = csv.DictReader(f)
-            for row in r:
-                if row["Date"] == today_iso:
-                    # we don’t have times stored; show “—”
-                    todays.append({
-                        "time": "—",
-                        "sid": row["Student ID"],
-                        "name": row["Name"],
-                        "status": row["Status"]
-                    })
-    except FileNotFoundError:
-        pass
+    # we don’t have times stored; show “—”
+    todays = [{"time": "—", "sid": sid, "name": name, "status": status}
+              for _, sid, name, status in rows_on(today_iso)]
+    # Absences aren't logged: on a meeting day, everyone without a row so far is missing
+    calendar = load_meetings()
+    logged = {row["sid"] for row in todays}
+    todays += [{"time": "—", "sid": sid, "name": students[sid], "status": "Absent"}
+               for sid in meetings.absent_on(calendar, today_iso, students, logged)]
+
+    # Archived seasons, from their cached summaries
+    past = [(label, seasons.season_summary(store().attendance_file, label))
+            for label in seasons.list_seasons(store().attendance_file)] if authed else []
+
+    # "Who came to every meeting last week?" and the like, off the bitmap index
+    sets, sets_error = None, None
+    if authed and any(request.args.get(k) for k in ("all", "any", "none")):
+        sets, sets_error = attendance_sets(request.args)
 
     return render_template_string(
         ADMIN_TMPL,
-        css=BASE_CSS,
         authed=authed,
         students=students,
         today=today_iso,
-        todays=todays
+        todays=todays,
+        past=past,
+        sets=sets,
+        sets_error=sets_error,
+        calendar=calendar,
+        format_weekly=meetings.format_weekly
     )
 
-@app.post("/admin/add-student")
+@team_route("/admin/add-student", methods=["POST"])
 def add_student():
-    if request.cookies.get("authed") != "1":
+    if not is_authed():
         flash("Unauthorized.", "error"); return redirect(url_for("admin"))
     sid = (request.form.get("sid") or "").strip()
     name = (request.form.get("name") or "").strip()
     if not sid or not name:
         flash("Please provide both ID and Name.", "error"); return redirect(url_for("admin"))
-    students = load_students()
-    if sid in students:
-        flash("That ID already exists.", "error"); return redirect(url_for("admin"))
-    students[sid] = name
-    save_students(students)
+    with locked():
+        students = load_students()
+        if sid in students:
+            flash("That ID already exists.", "error"); return redirect(url_for("admin"))
+        students[sid] = name
+        save_students(students)
     flash(f"Added {name}.", "ok")
     return redirect(url_for("admin"))
 
-@app.post("/admin/delete/<student_id>")
+@team_route("/admin/import-students", methods=["POST"])
+def import_students_form():
+    if not is_authed():
+        flash("Unauthorized.", "error"); return redirect(url_for("admin"))
+    upload = request.files.get("file")
+    if upload and upload.filename:
+        f = io.TextIOWrapper(upload.stream, encoding="utf-8-sig", newline="")
+    elif (request.form.get("rows") or "").strip():
+        f = StringIO(request.form["rows"])
+    else:
+        flash("Choose a file or paste some rows.", "error"); return redirect(url_for("admin"))
+    try:
+        report = import_students(f)
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        flash(f"Could not read import: {e}", "error"); return redirect(url_for("admin"))
+    flash(f"Import finished: {report.summary()}.", "ok" if report.ok else "error")
+    for line, msg in (report.conflicts + report.errors)[:10]:
+        flash(f"Line {line}: {msg}", "error")
+    return redirect(url_for("admin"))
+
+@team_route("/admin/delete/<student_id>", methods=["POST"])
 def delete_student(student_id):
-    if request.cookies.get("authed") != "1":
+    if not is_authed():
         flash("Unauthorized.", "error"); return redirect(url_for("admin"))
-    students = load_students()
-    if student_id in students:
-        name = students.pop(student_id)
-        save_students(students)
+    with locked():
+        students = load_students()
+        name = students.pop(student_id, None)
+        if name is not None:
+            save_students(students)
+    if name is not None:
         flash(f"Deleted {name}.", "ok")
     else:
         flash("Student not found.", "error")
     return redirect(url_for("admin"))
 
-@app.get("/download.csv")
+@team_route("/download.csv")
 def download_csv():
     # Stream the existing CSV
-    return send_file(FILENAME, as_attachment=True, download_name="attendance.csv")
+    return send_file(os.path.abspath(store().attendance_file), as_attachment=True, download_name="attendance.csv")
+
+@team_route("/admin/rollover", methods=["POST"])
+def rollover_season():
+    if not is_authed():
+        flash("Unauthorized.", "error"); return redirect(url_for("admin"))
+    st = store()
+    try:
+        counts = seasons.rollover(st.journal, st.season_start)
+    except (OSError, RuntimeError) as e:
+        flash(f"Rollover failed: {e}", "error")
+        return redirect(url_for("admin"))
+    if counts:
+        flash("Archived " + ", ".join(f"{label} ({n} rows)" for label, n in sorted(counts.items())) + ".", "ok")
+    else:
+        flash("Nothing to archive: the log only holds the current season.", "ok")
+    return redirect(url_for("admin"))
+
+@team_route("/admin/seasons/<season>.csv")
+def export_season(season):
+    if not is_authed():
+        flash("Unauthorized.", "error"); return redirect(url_for("admin"))
+    log_path = store().attendance_file
+    if season not in seasons.list_seasons(log_path):
+        abort(404)
 
-@app.post("/admin/mark-missing-absent")
+    def generate():
+        # Decompressed and written out a row at a time
+        buf = StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(UNIFIED_HEADER)
+        for rec in seasons.season_records(log_path, season):
+            writer.writerow(rec)
+            if buf.tell() > 64 * 1024:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        yield buf.getvalue()
+    return Response(generate(), mimetype="text/csv",
+                    headers={"Content-Disposition": f"attachment; filename=attendance-{season}.csv"})
+
+@team_route("/admin/mark-missing-absent", methods=["POST"])
 def mark_all_absent():
-    if request.cookies.get("authed") != "1":
+    if not is_authed():
         flash("Unauthorized.", "error"); return redirect(url_for("admin"))
-    students = load_students()
     today = datetime.date.today().isoformat()
-    # Build set of students present today
-    present = set()
+    with locked():
+        # No rows are written: making today a meeting day is what makes the missing students Absent
+        calendar = load_meetings()
+        if not meetings.is_meeting(calendar, today):
+            meetings.save_calendar(store().calendar_file, meetings.add_meeting(calendar, today))
+        students = load_students()
+        present = todays_present(today)
+        missing = sum(1 for sid in students if sid not in present)
+    flash(f"Today is a meeting day: {missing} students are Absent so far.", "ok")
+    return redirect(url_for("admin"))
+
+def calendar_from_form(form):
+    return {"weekly": [meetings.parse_weekly(line) for line in form.get("weekly", "").splitlines() if line.strip()],
+            "dates": meetings.parse_dates(form.get("dates", "")),
+            "cancelled": meetings.parse_dates(form.get("cancelled", ""))}
+
+@team_route("/admin/calendar", methods=["POST"])
+def save_calendar_form():
+    if not is_authed():
+        flash("Unauthorized.", "error"); return redirect(url_for("admin"))
     try:
-        with open(FILENAME, "r", encoding="utf-8") as f:
-            r = csv.DictReader(f)
-            for row in r:
-                if row["Date"] == today and row["Status"] == "Present":
-                    present.add(row["Student ID"])
-    except FileNotFoundError:
-        pass
-
-    # Append Absent rows for those not in present
-    wrote = 0
-    with open(FILENAME, "a", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        for sid, name in students.items():
-            if sid not in present:
-                w.writerow([today, sid, name, "Absent"])
-                wrote += 1
-    flash(f"Marked {wrote} students Absent for today.", "ok")
+        with locked():
+            meetings.save_calendar(store().calendar_file, calendar_from_form(request.form))
+    except ValueError as e:
+        flash(f"Calendar not saved: {e}", "error")
+    else:
+        flash("Meeting calendar saved.", "ok")
     return redirect(url_for("admin"))
 
 
 # API (optional): Get students / add via JSON
-@app.get("/api/students")
+@team_route("/api/students")
 def api_students():
-    return jsonify(load_students())
+    # ETag lets kiosks poll for roster changes without re-downloading it
+    resp = jsonify(load_students())
+    resp.add_etag()
+    return resp.make_conditional(request)
 
-@app.post("/api/students")
+@team_route("/api/students", methods=["POST"])
 def api_add_student():
-    if request.headers.get("X-Admin-Pin") != ADMIN_PIN:
+    if request.headers.get("X-Admin-Pin") != store().admin_pin:
         return jsonify({"error": "unauthorized"}), 401
     data = request.get_json(force=True)
     sid = str(data.get("id", "")).strip()
     name = str(data.get("name", "")).strip()
     if not sid or not name:
         return jsonify({"error": "missing fields"}), 400
-    students = load_students()
-    if sid in students:
-        return jsonify({"error": "id exists"}), 409
-    students[sid] = name
-    save_students(students)
+    with locked():
+        students = load_students()
+        if sid in students:
+            return jsonify({"error": "id exists"}), 409
+        students[sid] = name
+        save_students(students)
     return jsonify({"ok": True})
 
+# Bulk import: body is CSV (text/csv) or JSON / JSON Lines; ?dry_run=1 only reports
+@team_route("/api/students/import", methods=["POST"])
+def api_import_students():
+    if request.headers.get("X-Admin-Pin") != store().admin_pin:
+        return jsonify({"error": "unauthorized"}), 401
+    fmt = "csv" if request.mimetype == "text/csv" else None
+    f = io.TextIOWrapper(request.stream, encoding="utf-8-sig", newline="")
+    try:
+        report = import_students(f, fmt, dry_run=request.args.get("dry_run") == "1")
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        return jsonify({"error": f"unreadable import: {e}"}), 400
+    return jsonify(dict(report.as_dict(), ok=report.ok))
+
+# Attendance history for dashboards, paged with opaque cursors
+def _encode_cursor(log, index):
+    raw = f"{log.ident[0]}:{log.ident[1]}:{index}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_cursor(log, cursor):
+    # Cursors are row positions, so they only make sense for the same file
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        dev, ino, index = raw.split(":")
+        index = int(index)
+        if (int(dev), int(ino)) != log.ident or not 0 <= index <= len(log.rows):
+            return None
+        return index
+    except ValueError:
+        return None
+
+@team_route("/api/attendance")
+def api_attendance():
+    if not is_authed() and request.headers.get("X-Admin-Pin") != store().admin_pin:
+        return jsonify({"error": "unauthorized"}), 401
+    args = request.args
+    try:
+        start = datetime.date.fromisoformat(args["from"]).isoformat() if args.get("from") else None
+        end = datetime.date.fromisoformat(args["to"]).isoformat() if args.get("to") else None
+        limit = min(max(int(args.get("limit", API_PAGE_SIZE)), 1), API_PAGE_MAX)
+    except ValueError:
+        return jsonify({"error": "from/to must be YYYY-MM-DD and limit a number"}), 400
+
+    log = attendance_log()
+    after = 0
+    if args.get("cursor"):
+        after = _decode_cursor(log, args["cursor"])
+        if after is None:
+            return jsonify({"error": "invalid or expired cursor"}), 400
+    rows, resume = log.query(start, end, args.get("student"), args.get("status"), after, limit)
+    next_cursor = _encode_cursor(log, resume) if resume is not None else None
+
+    def generate():
+        # Stream the page row by row instead of building one big JSON string
+        yield '{"rows":['
+        for n, (date_iso, sid, name, status) in enumerate(rows):
+            yield ("," if n else "") + json.dumps({"date": date_iso, "id": sid, "name": name, "status": status}, ensure_ascii=False)
+        yield '],"next":' + json.dumps(next_cursor) + "}"
+    return Response(generate(), mimetype="application/json")
+
+# Set questions over meeting days, e.g. ?all=2025-10-06..2025-10-12 or ?all=2025-10-04&none=2025-10-11
+@team_route("/api/attendance/sets")
+def api_attendance_sets():
+    if not is_authed() and request.headers.get("X-Admin-Pin") != store().admin_pin:
+        return jsonify({"error": "unauthorized"}), 401
+    result, error = attendance_sets(request.args)
+    if error:
+        return jsonify({"error": error}), 400
+    return jsonify(result)
+
+# Meeting calendar, and the absences derived from it
+@team_route("/api/calendar")
+def api_calendar():
+    if not is_authed() and request.headers.get("X-Admin-Pin") != store().admin_pin:
+        return jsonify({"error": "unauthorized"}), 401
+    return jsonify(load_meetings())
+
+@team_route("/api/calendar", methods=["PUT"])
+def api_save_calendar():
+    if request.headers.get("X-Admin-Pin") != store().admin_pin:
+        return jsonify({"error": "unauthorized"}), 401
+    try:
+        with locked():
+            calendar = meetings.save_calendar(store().calendar_file, request.get_json(force=True))
+    except (ValueError, TypeError, AttributeError) as e:
+        return jsonify({"error": f"invalid calendar: {e}"}), 400
+    return jsonify(calendar)
+
+@team_route("/api/absences")
+def api_absences():
+    if not is_authed() and request.headers.get("X-Admin-Pin") != store().admin_pin:
+        return jsonify({"error": "unauthorized"}), 401
+    today = datetime.date.today().isoformat()
+    try:
+        start = datetime.date.fromisoformat(request.args.get("from") or today).isoformat()
+        end = datetime.date.fromisoformat(request.args.get("to") or today).isoformat()
+    except ValueError:
+        return jsonify({"error": "from/to must be YYYY-MM-DD"}), 400
+    students = load_students()
+    bitmaps = attendance_bitmaps()
+    roster = bitmaps.mask(students)
+    days = []
+    # Same meeting days and first-row rule as the season summaries and reports
+    for day in bitmaps.days_between(start, min(end, today)):
+        absent = bitmaps.missed_on(day, roster)
+        days.append({"date": day, "absent": [{"id": sid, "name": students[sid]} for sid in absent]})
+    return jsonify({"from": start, "to": end, "days": days})
+
+# Archived seasons: summaries only, read from the cache next to each archive
+@team_route("/api/seasons")
+def api_seasons():
+    if not is_authed() and request.headers.get("X-Admin-Pin") != store().admin_pin:
+        return jsonify({"error": "unauthorized"}), 401
+    log_path = store().attendance_file
+    out = []
+    for label in seasons.list_seasons(log_path):
+        summary = seasons.season_summary(log_path, label)
+        out.append({"season": label, "first": summary["first"], "last": summary["last"],
+                    "meeting_days": summary["meeting_days"], "rows": summary["rows"],
+                    "students": len(summary["students"])})
+    return jsonify({"seasons": out})
+
+@team_route("/api/seasons/<season>")
+def api_season(season):
+    if not is_authed() and request.headers.get("X-Admin-Pin") != store().admin_pin:
+        return jsonify({"error": "unauthorized"}), 401
+    log_path = store().attendance_file
+    if season not in seasons.list_seasons(log_path):
+        return jsonify({"error": "no such season"}), 404
+    summary = seasons.season_summary(log_path, season)
+    students = [{"id": key, "name": s["name"], "present": s["present"], "absent": s["absent"]}
+                for key, s in summary["students"].items()]
+    return jsonify({"season": season, "first": summary["first"], "last": summary["last"],
+                    "meeting_days": summary["meeting_days"], "students": students})
+
+# Kiosk sync: batched, idempotent event upload plus today's presence for convergence
+@team_route("/api/sync", methods=["POST"])
+def api_sync():
+    if request.headers.get("X-Admin-Pin") != store().admin_pin:
+        return jsonify({"error": "unauthorized"}), 401
+    data = request.get_json(force=True, silent=True) or {}
+    events = data.get("events")
+    if not isinstance(events, list):
+        return jsonify({"error": "missing events"}), 400
+    acked, applied, skipped = apply_sync_events([ev for ev in events if isinstance(ev, dict)])
+    return jsonify({"acked": acked, "applied": applied, "skipped": skipped})
+
+@team_route("/api/sync/today")
+def api_sync_today():
+    today = datetime.date.today().isoformat()
+    names = [name for _, _, name, status in rows_on(today) if status == "Present"]
+    resp = jsonify({"date": today, "present": names})
+    resp.add_etag()
+    return resp.make_conditional(request)
+
 
 if __name__ == "__main__":
     init_files()
+    # Development server only; use serve.py for the real thing
     # Run on all interfaces for LAN kiosk use
     app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)), debug=True)
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""Static assets for the web kiosk: hashed URLs, resized logos and gzip.
+
+- The stylesheet is served as its own file instead of being inlined into
+  every page, so tablets download it once.
+- The logo is resized to the sizes the pages actually display (Pillow,
+  optional) and the variants are cached on disk in ASSET_CACHE.
+- Asset URLs carry a content hash (/assets/logo-100.1a2b3c4d.png), so they
+  are served with far-future, immutable cache headers; a new logo or CSS
+  simply gets a new URL.
+- HTML and JSON responses (including streamed ones) are gzip-compressed for
+  clients that accept it, and their ETag becomes weak so a cache can't take
+  the compressed body for the uncompressed one. Text assets are compressed
+  once, up front.
+"""
+import gzip
+import hashlib
+import os
+import threading
+import zlib
+
+from flask import Response, abort, request, url_for
+
+try:
+    from PIL import Image
+except ImportError:  # Logos are then served at full size
+    Image = None
+
+ASSET_CACHE = "asset_cache"
+LOGO_SOURCES = ("static/logo.png", "logo.png")  # first one that exists wins
+IMMUTABLE = "public, max-age=31536000, immutable"
+COMPRESSIBLE = {"text/html", "application/json", "text/css", "application/javascript"}
+MIN_GZIP_SIZE = 512  # smaller bodies aren't worth the CPU or the header bytes
+
+
+def _digest(data):
+    return hashlib.sha1(data).hexdigest()[:10]
+
+
+class AssetPipeline:
+    def __init__(self, app, root=None):
+        self.root = root or app.root_path
+        self._assets = {}    # hashed file name -> (bytes, gzip bytes or None, mimetype)
+        self._urls = {}      # logical name -> hashed file name
+        self._logos = {}     # height -> (source mtime, hashed file name)
+        self._lock = threading.Lock()
+        self._logo_lock = threading.Lock()  # one thread resizes, the rest wait for its result
+        app.add_url_rule("/assets/<name>", "asset", self.serve)
+        app.jinja_env.globals.update(asset_url=self.url, logo_url=self.logo_url)
+        app.after_request(gzip_response)
+
+    def _add(self, name, data, mimetype):
+        stem, ext = os.path.splitext(name)
+        hashed = f"{stem}.{_digest(data)}{ext}"
+        packed = gzip.compress(data, 9) if mimetype in COMPRESSIBLE else None
+        with self._lock:
+            self._assets[hashed] = (data, packed, mimetype)
+            self._urls[name] = hashed
+        return hashed
+
+    def add_text(self, name, text, mimetype):
+        """Register an in-memory text asset (e.g. the stylesheet)."""
+        return self._add(name, text.encode("utf-8"), mimetype)
+
+    def url(self, name):
+        return url_for("asset", name=self._urls[name])
+
+    def logo_url(self, height):
+        """URL of the team logo scaled to `height` pixels tall."""
+        source = next((os.path.join(self.root, p) for p in LOGO_SOURCES
+                       if os.path.exists(os.path.join(self.root, p))), None)
+        if source is None:
+            return url_for("static", filename="logo.png")
+        mtime = os.path.getmtime(source)
+        with self._logo_lock:
+            cached = self._logos.get(height)
+            if not cached or cached[0] != mtime:
+                cached = self._logos[height] = (mtime, self._add(f"logo-{height}.png", self._logo_variant(source, height), "image/png"))
+        return url_for("asset", name=cached[1])
+
+    def _logo_variant(self, source, height):
+        with open(source, "rb") as f:
+            original = f.read()
+        if Image is None:
+            return original
+        path = os.path.join(self.root, ASSET_CACHE, f"logo-{height}-{_digest(original)}.png")
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with Image.open(source) as img:
+                img.thumbnail((height * 4, height), Image.LANCZOS)
+                tmp = f"{path}.{os.getpid()}.tmp"
+                img.save(tmp, "PNG", optimize=True)
+            os.replace(tmp, path)
+        with open(path, "rb") as f:
+            scaled = f.read()
+        # Resampling can undo the source's palette compression; never send more bytes than the original
+        return scaled if len(scaled) < len(original) else original
+
+    def serve(self, name):
+        asset = self._assets.get(name)
+        if asset is None:
+            abort(404)
+        data, packed, mimetype = asset
+        resp = Response(mimetype=mimetype)
+        if packed is not None and "gzip" in request.accept_encodings and len(packed) < len(data):
+            resp.set_data(packed)
+            resp.headers["Content-Encoding"] = "gzip"
+            resp.set_etag(name, weak=True)
+        else:
+            resp.set_data(data)
+            resp.set_etag(name)
+        resp.vary.add("Accept-Encoding")
+        resp.headers["Cache-Control"] = IMMUTABLE
+        return resp.make_conditional(request)
+
+
+def _gzip_stream(chunks):
+    z = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        data = z.compress(chunk)
+        if data:
+            yield data
+    yield z.flush()
+
+
+def _weaken_etag(resp):
+    # A strong ETag names exact bytes; the compressed body is only equivalent to them
+    etag, weak = resp.get_etag()
+    if etag and not weak:
+        resp.set_etag(etag, weak=True)
+
+
+def gzip_response(resp):
+    if resp.status_code == 304:
+        etag, weak = resp.get_etag()
+        if etag and not weak and request.if_none_match.is_weak(etag):
+            _weaken_etag(resp)  # the client's copy came compressed, under the weak tag
+        return resp
+    if (resp.status_code != 200 or resp.direct_passthrough or "Content-Encoding" in resp.headers
+            or resp.mimetype not in COMPRESSIBLE or "gzip" not in request.accept_encodings):
+        return resp
+    if resp.is_streamed:
+        resp.response = _gzip_stream(resp.response)
+        resp.headers.pop("Content-Length", None)
+    else:
+        data = resp.get_data()
+        if len(data) < MIN_GZIP_SIZE:
+            return resp
+        resp.set_data(gzip.compress(data, 6))
+    resp.headers["Content-Encoding"] = "gzip"
+    resp.vary.add("Accept-Encoding")
+    _weaken_etag(resp)
+    return resp
@@ -0,0 +1,382 @@
+"""Check-in rush load test for the web server.
+
+    python loadtest.py                           # 80 students, 4 tablets, closed loop
+    python loadtest.py --tablets 8 --workers 2   # more tablets against 2 gunicorn workers
+    python loadtest.py --open --duration 180     # students arrive at random over 3 minutes
+    python loadtest.py --url http://host:5000/t/loadtest --allow-writes --csv teams/loadtest/attendance.csv
+
+Unless --url is given, serve.py is started on a free port in a scratch folder
+with a generated roster, so real data is never touched. With --url the test
+adds its students and check-ins to that server for good, so it must point at
+a scratch team (serve.py --team loadtest) and be given --allow-writes. Each simulated student
+loads the check-in page, taps their name (sometimes twice, from two tablets at
+once, like an impatient student would) and the admin page is refreshed now and
+then. Two load models are available:
+
+- closed loop (default): each tablet starts the next student as soon as the
+  previous one is done, which measures the best throughput the server manages.
+- open loop (--open): students arrive at random times spread over --duration,
+  whether or not the server has kept up. Page loads and check-in taps are
+  measured from the planned arrival time, so a backed-up server shows up in
+  the percentiles.
+
+Taps ask /checkin for a JSON answer, so a tap only counts as accepted when
+the server says it marked the student (not "already marked" or "not found").
+Afterwards attendance.csv is checked: every student whose tap was accepted
+must have exactly one Present row for today (no lost writes, no duplicates).
+The exit status is 1 if any check or request failed. Only the standard
+library is used.
+"""
+import argparse
+import datetime
+import http.client
+import json
+import os
+import queue
+import random
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Shared"))
+from attendance_log import open_log, read_records
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STARTUP_TIMEOUT = 30  # seconds to wait for serve.py to accept connections
+
+
+# ---------- Server ----------
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(folder, students, threads, workers):
+    """Run serve.py against a scratch folder; returns (process, base url)."""
+    with open(os.path.join(folder, "students.json"), "w", encoding="utf-8") as f:
+        json.dump(students, f, indent=2)
+    port = free_port()
+    cmd = [sys.executable, os.path.join(HERE, "serve.py"), "--host", "127.0.0.1", "--port", str(port),
+           "--threads", str(threads), "--workers", str(workers)]
+    with open(os.path.join(folder, "server.log"), "w") as log:
+        proc = subprocess.Popen(cmd, cwd=folder, stdout=subprocess.DEVNULL, stderr=log)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + STARTUP_TIMEOUT
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"serve.py exited with status {proc.returncode}; see {folder}/server.log")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return proc, url
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"serve.py did not start within {STARTUP_TIMEOUT}s")
+
+
+def stop_server(proc):
+    proc.terminate()  # serve.py flushes its files on SIGTERM
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+# ---------- Client ----------
+class Tablet:
+    """One kiosk: a keep-alive connection that reconnects when the server drops it."""
+
+    def __init__(self, url, pin):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.pin = pin
+        self.conn = None
+
+    def request(self, method, path, headers=None, body=None):
+        headers = dict(headers or {})
+        for attempt in (1, 2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            try:
+                self.conn.request(method, self.prefix + path, body, headers)
+                resp = self.conn.getresponse()
+                body = resp.read()
+                if resp.getheader("Connection", "").lower() == "close":
+                    self.close()
+                return resp.status, body
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # A kept-alive connection the server had already closed; retry once on a fresh one
+                self.close()
+                if attempt == 2:
+                    raise
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def page(self):
+        return self.request("GET", "/")
+
+    def checkin(self, sid):
+        return self.request("POST", f"/checkin/{sid}", {"Content-Length": "0", "Accept": "application/json"})
+
+    def admin(self):
+        return self.request("GET", "/admin", {"Cookie": "authed=1"})
+
+    def add_student(self, sid, name):
+        return self.request("POST", "/api/students", {"Content-Type": "application/json", "X-Admin-Pin": self.pin},
+                            json.dumps({"id": sid, "name": name}))
+
+
+class Results:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = defaultdict(list)  # kind -> seconds
+        self.errors = Counter()           # kind -> failed requests
+        self.accepted = set()             # student IDs with at least one accepted tap
+        self.error_samples = []
+
+    def record(self, kind, seconds, ok, detail=None):
+        with self.lock:
+            self.latency[kind].append(seconds)
+            if not ok:
+                self.errors[kind] += 1
+                if len(self.error_samples) < 5:
+                    self.error_samples.append(f"{kind}: {detail}")
+
+
+def timed(results, kind, call, start=None):
+    """Run one request, recording its latency from start (default: now); returns (status, body)."""
+    start = time.perf_counter() if start is None else start
+    try:
+        status, body = call()
+        ok, detail = status < 400, status
+    except (OSError, http.client.HTTPException) as e:
+        status, body, ok, detail = None, b"", False, e
+    results.record(kind, time.perf_counter() - start, ok, detail)
+    return status, body
+
+
+def marked(status, body):
+    """Did the server say this tap marked the student Present?"""
+    if status != 200:
+        return False
+    try:
+        return json.loads(body.decode("utf-8")).get("ok") is True
+    except (ValueError, AttributeError):
+        return False
+
+
+def student_visit(tablet, twin, sid, results, args, rng, start=None):
+    """Load the page, tap the name (maybe twice at once), maybe refresh the admin page.
+
+    start is the planned arrival (open loop); the page and the taps are timed from it.
+    """
+    timed(results, "page", tablet.page, start)
+    taps = [tablet]
+    if twin is not None and rng.random() < args.double_tap:
+        taps.append(twin)
+    answers = []
+
+    def tap(t):
+        answers.append(timed(results, "checkin", lambda: t.checkin(sid), start))
+
+    threads = [threading.Thread(target=tap, args=(t,)) for t in taps[1:]]
+    for t in threads:
+        t.start()
+    tap(tablet)
+    for t in threads:
+        t.join()
+    if any(marked(status, body) for status, body in answers):
+        with results.lock:
+            results.accepted.add(sid)
+    if rng.random() < args.admin_rate:
+        timed(results, "admin", tablet.admin)
+
+
+def run_closed(url, sids, args, results):
+    todo = queue.Queue()
+    for sid in sids:
+        todo.put(sid)
+
+    def tablet_loop(n):
+        rng = random.Random(args.seed + n)
+        tablet, twin = Tablet(url, args.pin), Tablet(url, args.pin)
+        try:
+            while True:
+                try:
+                    sid = todo.get_nowait()
+                except queue.Empty:
+                    return
+                student_visit(tablet, twin, sid, results, args, rng)
+                if args.think:
+                    time.sleep(rng.uniform(0, 2 * args.think))
+        finally:
+            tablet.close()
+            twin.close()
+
+    threads = [threading.Thread(target=tablet_loop, args=(n,)) for n in range(args.tablets)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def run_open(url, sids, args, results):
+    # Arrival times uniformly spread over the window (a Poisson process conditioned on the count)
+    rng = random.Random(args.seed)
+    began = time.perf_counter()
+    arrivals = sorted(rng.uniform(0, args.duration) for _ in sids)
+    visitors = []
+    for n, (sid, at) in enumerate(zip(sids, arrivals)):
+        delay = began + at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+        def visit(sid=sid, start=began + at, n=n):
+            tablet, twin = Tablet(url, args.pin), Tablet(url, args.pin)
+            try:
+                student_visit(tablet, twin, sid, results, args, random.Random(args.seed + n), start)
+            finally:
+                tablet.close()
+                twin.close()
+
+        t = threading.Thread(target=visit)
+        t.start()
+        visitors.append(t)
+    for t in visitors:
+        t.join()
+
+
+# ---------- Report ----------
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(p / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+def print_report(results, elapsed):
+    print(f"{'request':<10}{'count':>7}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    total = 0
+    for kind in ("page", "checkin", "admin"):
+        values = sorted(results.latency.get(kind, []))
+        total += len(values)
+        if not values:
+            continue
+        ms = [percentile(values, p) * 1000 for p in (50, 95, 99, 100)]
+        print(f"{kind:<10}{len(values):>7}{results.errors[kind]:>8}" + "".join(f"{v:>9.1f}" for v in ms))
+    print(f"{total} requests in {elapsed:.1f}s = {total / elapsed if elapsed else 0:.1f} req/s")
+    for sample in results.error_samples:
+        print(f"  e.g. {sample}")
+
+
+def verify(csv_path, sids, accepted, date_iso):
+    """Check today's rows in the log; returns a list of problems (empty = pass)."""
+    present = Counter()
+    with open_log(csv_path) as f:
+        for rec in read_records(f):
+            if rec.date == date_iso and rec.status == "Present" and rec.sid in sids:
+                present[rec.sid] += 1
+    problems = []
+    duplicates = sorted(sid for sid, n in present.items() if n > 1)
+    lost = sorted(sid for sid in accepted if present[sid] == 0)
+    unanswered = sorted(set(sids) - accepted)
+    if duplicates:
+        problems.append(f"{len(duplicates)} students have duplicate Present rows: {', '.join(duplicates[:10])}")
+    if lost:
+        problems.append(f"{len(lost)} accepted check-ins are missing from the log: {', '.join(lost[:10])}")
+    if unanswered:
+        problems.append(f"{len(unanswered)} students never got a successful check-in response")
+    print(f"Log check: {sum(present.values())} Present rows for {len(present)} of {len(sids)} students, "
+          f"{len(duplicates)} duplicated, {len(lost)} lost.")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate a check-in rush against the web server.")
+    parser.add_argument("--students", type=int, default=80)
+    parser.add_argument("--tablets", type=int, default=4, help="concurrent kiosks in closed-loop mode")
+    parser.add_argument("--think", type=float, default=0.0,
+                        help="average seconds between students on one tablet (closed loop)")
+    parser.add_argument("--open", action="store_true", help="open loop: students arrive at random over --duration")
+    parser.add_argument("--duration", type=float, default=180.0, help="arrival window in seconds (open loop)")
+    parser.add_argument("--double-tap", type=float, default=0.2,
+                        help="fraction of students who tap on two tablets at once")
+    parser.add_argument("--admin-rate", type=float, default=0.1,
+                        help="fraction of students followed by an admin page refresh")
+    parser.add_argument("--threads", type=int, default=8, help="server threads (ignored with --url)")
+    parser.add_argument("--workers", type=int, default=1, help="server worker processes (ignored with --url)")
+    parser.add_argument("--url", help="test an already running server instead of starting one")
+    parser.add_argument("--csv", help="its attendance.csv, for the log check (with --url)")
+    parser.add_argument("--allow-writes", action="store_true",
+                        help="with --url: let the test leave its students and check-ins in that team")
+    parser.add_argument("--pin", default=os.environ.get("ADMIN_PIN", "1234"))
+    parser.add_argument("--seed", type=int, default=1164)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch folder for inspection")
+    args = parser.parse_args(argv)
+
+    # IDs that can't collide with a real roster, in case --url points at one
+    run = datetime.datetime.now().strftime("%H%M%S")
+    students = {f"load{run}-{n:04d}": f"Load Test {run} {n}" for n in range(1, args.students + 1)}
+    sids = list(students)
+    folder = proc = None
+    if args.url:
+        url, csv_path = args.url.rstrip("/"), args.csv
+        if not re.search(r"/t/[A-Za-z0-9_-]+$", urlsplit(url).path) or not args.allow_writes:
+            sys.exit("--url adds students and check-ins that are never removed: point it at a scratch team "
+                     "(like http://host:5000/t/loadtest, from serve.py --team loadtest) and pass --allow-writes")
+        tablet = Tablet(url, args.pin)
+        for sid, name in students.items():
+            status, _ = tablet.add_student(sid, name)
+            if status != 200:
+                sys.exit(f"Could not add load-test students (HTTP {status}); check --pin")
+        tablet.close()
+    else:
+        folder = tempfile.mkdtemp(prefix="attendance-load-")
+        proc, url = start_server(folder, students, args.threads, args.workers)
+        csv_path = os.path.join(folder, "attendance.csv")
+
+    mode = f"open loop over {args.duration:.0f}s" if args.open else f"closed loop, {args.tablets} tablets"
+    print(f"{args.students} students against {url} ({mode})")
+    results = Results()
+    began = time.perf_counter()
+    try:
+        (run_open if args.open else run_closed)(url, sids, args, results)
+        elapsed = time.perf_counter() - began
+    finally:
+        if proc is not None:
+            stop_server(proc)
+
+    print_report(results, elapsed)
+    problems = []
+    if csv_path:
+        problems = verify(csv_path, set(sids), results.accepted, datetime.date.today().isoformat())
+    else:
+        print("Log check skipped (pass --csv with --url).")
+    if sum(results.errors.values()):
+        problems.append(f"{sum(results.errors.values())} requests failed")
+
+    if folder is not None:
+        if args.keep:
+            print(f"Data kept in {folder}")
+        else:
+            shutil.rmtree(folder, ignore_errors=True)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Production entry point for the attendance web server.
+
+    python serve.py                      # waitress, 8 threads, port 5000
+    python serve.py --threads 16
+    python serve.py --workers 4          # gunicorn (Linux/macOS), 4 processes
+    python serve.py --team 1164 --team 254   # also host these teams under /t/<team>/
+
+Caches are warmed before the first request is accepted, and on SIGINT/SIGTERM
+in-flight writes are allowed to finish and flushed to disk before exiting.
+Workers coordinate through the lock file used by Web1.locked(), so running
+several processes against the same data files is safe.
+"""
+import argparse
+import os
+import signal
+import sys
+
+import Web1
+
+
+def _serve_threaded(host, port, threads):
+    try:
+        from waitress import serve
+    except ImportError:
+        serve = None
+
+    if serve is not None:
+        serve(Web1.app, host=host, port=port, threads=threads)
+        return
+
+    # No waitress installed: Werkzeug's threaded server, without the reloader or debugger
+    from werkzeug.serving import make_server
+    print("waitress not installed; falling back to Werkzeug's threaded server", file=sys.stderr)
+    make_server(host, port, Web1.app, threaded=True).serve_forever()
+
+
+def _serve_workers(host, port, workers, threads):
+    from gunicorn.app.base import BaseApplication
+
+    class Application(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", "%s:%d" % (host, port))
+            self.cfg.set("workers", workers)
+            self.cfg.set("threads", threads)
+            self.cfg.set("preload_app", True)  # warm once in the master, then fork
+            self.cfg.set("graceful_timeout", 30)
+            self.cfg.set("worker_exit", lambda server, worker: Web1.shutdown_storage())
+
+        def load(self):
+            return Web1.app
+
+    Application().run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the attendance web server.")
+    parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 5000)))
+    parser.add_argument("--threads", type=int, default=int(os.environ.get("THREADS", 8)),
+                        help="request threads per worker")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WORKERS", 1)),
+                        help="worker processes (needs gunicorn; not available on Windows)")
+    parser.add_argument("--team", action="append", default=[],
+                        help="host this team under /t/<team>/, creating its folder if needed (repeatable)")
+    args = parser.parse_args(argv)
+
+    Web1.warm_caches(args.team)
+
+    if args.workers > 1:
+        _serve_workers(args.host, args.port, args.workers, args.threads)
+        return
+
+    # Turn SIGTERM into the same clean exit as Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        _serve_threaded(args.host, args.port, args.threads)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        Web1.shutdown_storage()
+
+
+if __name__ == "__main__":
+    main()